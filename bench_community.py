@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Community の Global Achievements ページの解析を計測するベンチマーク（ネットワークは使わない）。
+
+実際のページに似せた合成ページ（ヘッダーに大量の <script>、末尾に大きなフッター）を作り、
+16 KiB ずつ渡して逐次パース（_parse_community_achievement_rows）にかかる時間・読んだバイト数・
+行の正しさを表示する。比較用に、以前の「ページ全体に h3/h5 の正規表現」の結果も並べる。
+
+    python bench_community.py
+    python bench_community.py --rows 100,5000 --scripts 2000 --footer-mb 3 --tracemalloc
+    python bench_community.py --rows 500 --write-fixture page.html   # 合成ページを保存するだけ
+"""
+
+import argparse
+import html
+import re
+import sys
+import time
+import tracemalloc
+
+import steam_achievements_exporter as sae
+
+CHUNK_SIZE = 16 * 1024
+
+
+def make_fixture_page(rows: int, scripts: int = 2000, footer_mb: float = 3.0):
+    """合成ページ（bytes）と、期待する行 [{name, description, percent}, ...] を返す。
+
+    ヘッダーの <script> には h3 を含む文字列を入れておく（以前の正規表現が取り違えた形）。
+    表示名・説明には日本語と文字参照（&amp; など）も混ぜる。
+    """
+    expected = []
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Global Achievements</title>\n']
+    for i in range(scripts):
+        parts.append(
+            f'<script type="text/javascript">var g_tooltip_{i} = "<h3 class=\\"tip\\">Tooltip {i}</h3>";'
+            f' function f{i}(a) {{ return a + {i}; }}</script>\n'
+        )
+    parts.append('</head><body><div id="global_header"><div class="content">Steam</div></div>\n')
+    parts.append('<div id="mainContents"><div id="headerContent"><h1>ゲーム</h1></div>\n')
+    parts.append('<div id="personalAchieve">\n')
+    for i in range(rows):
+        row = {
+            "name": f"実績 {i} & <特別>",
+            "description": "" if i % 7 == 0 else f"ボスを {i} 回倒す \"説明\" {i}",
+            "percent": round(100.0 / (i + 1), 1),
+        }
+        expected.append(row)
+        parts.append(
+            '<div class="achieveRow ">\n'
+            f'  <div class="achieveImgHolder"><img src="https://example.invalid/{i}.jpg" width="64"></div>\n'
+            '  <div class="achieveTxtHolder">\n'
+            f'    <div class="achievePercent">{row["percent"]}%</div>\n'
+            '    <div class="achieveTxt">\n'
+            f'      <h3>{html.escape(row["name"])}</h3>\n'
+            f'      <h5>{html.escape(row["description"])}</h5>\n'
+            '    </div>\n'
+            '  </div>\n'
+            '</div>\n'
+        )
+    parts.append('</div></div>\n<div id="footer">\n')
+    filler = '<div class="footer_block"><span>Valve Corporation. 利用規約 &copy; 2026</span></div>\n'
+    parts.append(filler * max(0, int(footer_mb * 1024 * 1024 / len(filler.encode("utf-8")))))
+    parts.append('</div></body></html>\n')
+    return "".join(parts).encode("utf-8"), expected
+
+
+class _CountingChunks:
+    """ページを CHUNK_SIZE ずつ渡し、実際に渡したバイト数を数える（レスポンスの iter_content 相当）。"""
+
+    def __init__(self, data: bytes, size: int = CHUNK_SIZE):
+        self.data = data
+        self.size = size
+        self.read = 0
+
+    def __iter__(self):
+        for pos in range(0, len(self.data), self.size):
+            chunk = self.data[pos:pos + self.size]
+            self.read += len(chunk)
+            yield chunk
+
+
+def _regex_pairs(page: bytes) -> dict:
+    """以前の実装（ページ全体を文字列にして h3/h5 を正規表現で対にする）。比較用。"""
+    text = page.decode("utf-8", errors="replace")
+    pairs = re.findall(r"<h3[^>]*>(.*?)</h3>.*?<h5[^>]*>(.*?)</h5>", text, flags=re.S | re.I)
+    out = {}
+    for raw_title, raw_desc in pairs:
+        title = html.unescape(re.sub(r"<[^>]+>", "", raw_title)).strip()
+        if title:
+            out[title] = html.unescape(re.sub(r"<[^>]+>", "", raw_desc)).strip()
+    return out
+
+
+def _count_wrong(got_rows, expected) -> int:
+    """期待と違う行（足りない・余分な行も含む）の数。"""
+    return abs(len(got_rows) - len(expected)) + sum(1 for g, e in zip(got_rows, expected) if g != e)
+
+
+def run_one(rows: int, scripts: int, footer_mb: float, repeat: int, trace: bool) -> None:
+    page, expected = make_fixture_page(rows, scripts, footer_mb)
+    size_mb = len(page) / 1024 / 1024
+
+    best = None
+    read = 0
+    got = []
+    peak = None
+    for _ in range(max(1, repeat)):
+        chunks = _CountingChunks(page)
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        got = sae._parse_community_achievement_rows(iter(chunks))
+        elapsed = time.perf_counter() - started
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        best = elapsed if best is None else min(best, elapsed)
+        read = chunks.read
+    got_rows = [
+        {"name": r["name"], "description": r["description"], "percent": r["percent"]} for r in got
+    ]
+    wrong = _count_wrong(got_rows, expected)
+    line = (
+        f"{rows:>6,} 行 / ページ {size_mb:6.2f} MB  逐次: {best * 1000:8.1f} ms  "
+        f"読んだ {read / 1024 / 1024:6.2f} MB  行 {len(got):,}（誤り {wrong}）"
+    )
+    if peak is not None:
+        line += f"  最大 {peak / 1024 / 1024:.1f} MB"
+    print(line, flush=True)
+
+    started = time.perf_counter()
+    pairs = _regex_pairs(page)
+    elapsed = time.perf_counter() - started
+    by_name = {e["name"]: e["description"] for e in expected}
+    regex_wrong = sum(1 for name, desc in by_name.items() if pairs.get(name) != desc)
+    print(f"{'':>6}   正規表現（以前）: {elapsed * 1000:8.1f} ms  対 {len(pairs):,}（誤り {regex_wrong}）", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Community ページの逐次パースを測る")
+    parser.add_argument("--rows", default="100,5000", help="実績数をカンマ区切りで（既定 100,5000）")
+    parser.add_argument("--scripts", type=int, default=2000, help="ヘッダーの <script> の数（既定 2000）")
+    parser.add_argument("--footer-mb", type=float, default=3.0, help="フッターの大きさ MB（既定 3）")
+    parser.add_argument("--repeat", type=int, default=3, help="繰り返して最速を取る回数（既定 3）")
+    parser.add_argument("--tracemalloc", action="store_true", help="最大メモリも測る（遅くなる）")
+    parser.add_argument("--write-fixture", metavar="FILE", help="最初の実績数の合成ページを保存して終わる")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(n) for n in args.rows.split(",") if n.strip()]
+    except ValueError:
+        print(f"--rows は整数のカンマ区切りで指定してください: {args.rows}", file=sys.stderr)
+        return 2
+    if not sizes:
+        sizes = [100]
+
+    if args.write_fixture:
+        page, _expected = make_fixture_page(sizes[0], args.scripts, args.footer_mb)
+        with open(args.write_fixture, "wb") as f:
+            f.write(page)
+        print(f"{args.write_fixture}: {sizes[0]:,} 行 / {len(page) / 1024 / 1024:.2f} MB")
+        return 0
+
+    print(f"ヘッダー <script> {args.scripts:,} 個 / フッター {args.footer_mb:g} MB / "
+          f"チャンク {CHUNK_SIZE // 1024} KiB（Python {sys.version.split()[0]}）")
+    for rows in sizes:
+        run_one(rows, args.scripts, args.footer_mb, args.repeat, args.tracemalloc)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
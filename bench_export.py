@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Export の書き込み段だけを計測するベンチマーク（ネットワーク / Steam は使わない）。
+
+合成した実績データ（既定: 10,000 ゲーム × 50 実績 = 50 万行）を、ゲームごとに
+_export_rows で ExportRow にしてから各出力（CSV / 圧縮 CSV / JSON Lines / Excel / SQLite）に書き、
+CPU 時間・経過時間・ファイルサイズを出力ごとに表示する。--tracemalloc を付けると
+Python 側の最大メモリも測る（その分遅くなるので時間は別に測ること）。
+
+    python bench_export.py
+    python bench_export.py --games 2000 --only csv,xlsx --tracemalloc
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import steam_achievements_exporter as sae
+
+STEAM_ID = "76561190000000000"
+
+
+def _make_achievements(per_game: int):
+    """schema と取得状況の組（説明が空の実績、記号入りの表示名も混ぜる）。"""
+    achievements = []
+    for i in range(per_game):
+        achievements.append({
+            "name": f"ACH_{i:03d}",
+            "displayName": f"実績 {i} <&>",
+            "description": "" if i % 10 == 0 else f"説明テキスト {i} " * 3,
+            "_desc_source": "schema_jp",
+        })
+    status = {a["name"]: i % 2 for i, a in enumerate(achievements)}
+    unlock_times = {a["name"]: 1700000000 + i for i, a in enumerate(achievements) if i % 2}
+    percents = {a["name"]: 100.0 / (i + 1) for i, a in enumerate(achievements)}
+    return achievements, status, unlock_times, percents
+
+
+def _bench_targets(out_dir: str) -> dict:
+    """名前 -> 出力を開く関数。zstd は使える環境のときだけ。"""
+    targets = {
+        "csv": lambda: sae._CsvSink(os.path.join(out_dir, "bench.csv")),
+        "csv.gz": lambda: sae._CsvSink(os.path.join(out_dir, "bench.csv.gz"), compression="gzip"),
+        "jsonl": lambda: sae._JsonlSink(os.path.join(out_dir, "bench.jsonl")),
+        "jsonl.gz": lambda: sae._JsonlSink(os.path.join(out_dir, "bench.jsonl.gz"), compression="gzip"),
+        "xlsx": lambda: sae._XlsxSink(os.path.join(out_dir, "bench.xlsx")),
+        "xlsx/game": lambda: sae._XlsxSink(os.path.join(out_dir, "bench_games.xlsx"), per_game=True),
+        "sqlite": lambda: sae._SqliteSink(os.path.join(out_dir, "bench.sqlite3"), STEAM_ID),
+    }
+    if sae._zstd_available():
+        targets["csv.zst"] = lambda: sae._CsvSink(os.path.join(out_dir, "bench.csv.zst"), compression="zstd")
+    return targets
+
+
+def run_one(make_sink, games: int, per_game: int, trace: bool = False) -> dict:
+    achievements, status, unlock_times, percents = _make_achievements(per_game)
+    if trace:
+        tracemalloc.start()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    sink = make_sink()
+    try:
+        for appid in range(1, games + 1):
+            rows = sae._export_rows(f"Game {appid}", achievements, status, appid=appid,
+                                    unlock_times=unlock_times, percents=percents)
+            sink.write(rows)
+    finally:
+        sink.close()
+    result = {
+        "cpu": time.process_time() - cpu,
+        "wall": time.perf_counter() - wall,
+        "size": os.path.getsize(sink.path),
+        "peak": None,
+    }
+    if trace:
+        result["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export の出力ごとの書き込み時間を測る")
+    parser.add_argument("--games", type=int, default=10000, help="ゲーム数（既定 10000）")
+    parser.add_argument("--per-game", type=int, default=50, help="1ゲームあたりの実績数（既定 50）")
+    parser.add_argument("--only", default="", help="測る出力をカンマ区切りで（例: csv,xlsx）")
+    parser.add_argument("--tracemalloc", action="store_true", help="最大メモリも測る（遅くなる）")
+    parser.add_argument("--keep", metavar="DIR", help="出力をこのフォルダに残す（既定は一時フォルダを削除）")
+    args = parser.parse_args(argv)
+
+    available = list(_bench_targets(""))
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or available
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        print(f"不明な出力: {', '.join(unknown)}（{', '.join(available)} から選択）", file=sys.stderr)
+        return 2
+
+    out_dir = args.keep or tempfile.mkdtemp(prefix="bench_export_")
+    os.makedirs(out_dir, exist_ok=True)
+    targets = _bench_targets(out_dir)
+
+    total = args.games * args.per_game
+    print(f"{args.games} ゲーム × {args.per_game} 実績 = {total:,} 行（Python {sys.version.split()[0]}）")
+    try:
+        for name in names:
+            r = run_one(targets[name], args.games, args.per_game, trace=args.tracemalloc)
+            line = (
+                f"{name:10s} CPU {r['cpu']:6.2f} 秒  経過 {r['wall']:6.2f} 秒  "
+                f"{total / max(r['wall'], 1e-9):>9,.0f} 行/秒  {r['size'] / 1024 / 1024:8.2f} MB"
+            )
+            if r["peak"] is not None:
+                line += f"  最大 {r['peak'] / 1024 / 1024:.1f} MB"
+            print(line, flush=True)
+    finally:
+        if not args.keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    peak = sae._peak_memory_bytes()
+    if peak:
+        print(f"プロセスの最大メモリ: {peak / 1024 / 1024:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
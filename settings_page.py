@@ -18,7 +18,20 @@ class SettingsPage(tk.Frame):
         steam_id_var: tk.StringVar,
         steam_path_var: tk.StringVar,
         output_path_var: tk.StringVar,
+        prefer_local_var: tk.BooleanVar = None,
+        offline_mode_var: tk.BooleanVar = None,
+        background_warm_var: tk.BooleanVar = None,
+        export_jsonl_var: tk.BooleanVar = None,
+        export_sqlite_var: tk.BooleanVar = None,
+        export_sqlite_upsert_var: tk.BooleanVar = None,
+        export_xlsx_var: tk.BooleanVar = None,
+        export_xlsx_per_game_var: tk.BooleanVar = None,
+        export_per_game_var: tk.BooleanVar = None,
+        export_compress_var: tk.BooleanVar = None,
         save_config_callback=None,
+        build_index_callback=None,
+        export_cache_callback=None,
+        import_cache_callback=None,
         *args,
         **kwargs
     ):
@@ -28,7 +41,20 @@ class SettingsPage(tk.Frame):
         self.steam_id = steam_id_var
         self.steam_path = steam_path_var
         self.output_path = output_path_var
+        self.prefer_local = prefer_local_var
+        self.offline_mode = offline_mode_var
+        self.background_warm = background_warm_var
+        self.export_jsonl = export_jsonl_var
+        self.export_sqlite = export_sqlite_var
+        self.export_sqlite_upsert = export_sqlite_upsert_var
+        self.export_xlsx = export_xlsx_var
+        self.export_xlsx_per_game = export_xlsx_per_game_var
+        self.export_per_game = export_per_game_var
+        self.export_compress = export_compress_var
         self.save_config_callback = save_config_callback
+        self.build_index_callback = build_index_callback
+        self.export_cache_callback = export_cache_callback
+        self.import_cache_callback = import_cache_callback
 
         self._build_layout()
         self._setup_trace()
@@ -128,6 +154,29 @@ class SettingsPage(tk.Frame):
         return entry
 
 
+    # =============================================================================
+    # ⭐Checkbutton 行
+    # =============================================================================
+    def _check_row(self, parent, text, variable):
+        row = tk.Frame(parent, bg=BG_PANEL)
+        row.pack(fill="x", pady=(0, 6))
+
+        tk.Label(row, text="", bg=BG_PANEL, fg=FG_MAIN,
+                 width=14, anchor="e").pack(side="left")
+
+        tk.Checkbutton(
+            row,
+            text=text,
+            variable=variable,
+            bg=BG_PANEL, fg=FG_MAIN,
+            activebackground=BG_PANEL, activeforeground="#ffffff",
+            selectcolor=SEARCH_BG,
+            highlightthickness=0, bd=0,
+            font=("NotoSansJP", 9),
+            anchor="w"
+        ).pack(side="left")
+        return row
+
     # =============================================================================
     # UI 本体
     # =============================================================================
@@ -237,8 +286,63 @@ class SettingsPage(tk.Frame):
         stats_link.pack(side="left", padx=(10, 0))
         stats_link.bind("<Button-1>", lambda e: self._open_stats_folder())
 
+        if self.build_index_callback:
+            index_link = tk.Label(
+                btns, text="索引作成",
+                bg=BG_PANEL, fg="#93c5fd",
+                font=("NotoSansJP", 10, "underline"),
+                cursor="hand2"
+            )
+            index_link.pack(side="left", padx=(10, 0))
+            index_link.bind("<Button-1>", lambda e: self.build_index_callback())
+
+        # キャッシュを他のPCへ持ち出す / 取り込む
+        if self.export_cache_callback:
+            export_link = tk.Label(
+                btns, text="キャッシュ書出",
+                bg=BG_PANEL, fg="#93c5fd",
+                font=("NotoSansJP", 10, "underline"),
+                cursor="hand2"
+            )
+            export_link.pack(side="left", padx=(10, 0))
+            export_link.bind("<Button-1>", lambda e: self._choose_cache_export())
+
+        if self.import_cache_callback:
+            import_link = tk.Label(
+                btns, text="取込",
+                bg=BG_PANEL, fg="#93c5fd",
+                font=("NotoSansJP", 10, "underline"),
+                cursor="hand2"
+            )
+            import_link.pack(side="left", padx=(8, 0))
+            import_link.bind("<Button-1>", lambda e: self._choose_cache_import())
+
         self.after(100, self._update_steam_status)
 
+        # ローカルキャッシュの取得状況を優先（Web API 呼び出しを省略）
+        if self.prefer_local is not None:
+            self._check_row(
+                form,
+                "Steam のローカルキャッシュにある取得状況を優先する（Web API 呼び出しを省略）",
+                self.prefer_local,
+            )
+
+        # オフラインモード（API Key 不要 / ネットワーク不使用）
+        if self.offline_mode is not None:
+            self._check_row(
+                form,
+                "オフラインモード（ネットワークを使わず、Steam のローカルキャッシュだけで一覧/Export）",
+                self.offline_mode,
+            )
+
+        # 操作していない間に schema / 説明をキャッシュへ先読み
+        if self.background_warm is not None:
+            self._check_row(
+                form,
+                "一覧取得後、操作していない間に実績データを先読みする（最近遊んだ順）",
+                self.background_warm,
+            )
+
         # --- 出力先（100%）＋ 📁 アイコン
         row3 = tk.Frame(form, bg=BG_PANEL)
         row3.pack(fill="x", pady=6)
@@ -257,6 +361,54 @@ class SettingsPage(tk.Frame):
             right_command=self._browse_output_path
         )
 
+        # ゲームごとに別の CSV（出力先フォルダの SteamGames_achievements\ に manifest.json と一緒に置く）
+        if self.export_per_game is not None:
+            self._check_row(
+                form,
+                "ゲームごとに別の CSV に分けて書き出す（SteamGames_achievements フォルダ＋manifest.json）",
+                self.export_per_game,
+            )
+
+        # 圧縮（形式とレベルは config.json の export_compression / export_compression_level）
+        if self.export_compress is not None:
+            self._check_row(
+                form,
+                "CSV / JSON Lines を圧縮して書き出す（既定は .gz。config.json で zstd や圧縮レベルも指定可）",
+                self.export_compress,
+            )
+
+        # CSV と同じ場所・同じ名前で追加の形式も書き出す
+        if self.export_jsonl is not None:
+            self._check_row(
+                form,
+                "JSON Lines（.jsonl）も書き出す（AppID / apiname / 解除日時 / 説明の取得元つき）",
+                self.export_jsonl,
+            )
+        if self.export_sqlite is not None:
+            self._check_row(
+                form,
+                "SQLite データベース（.sqlite3）も書き出す（games / achievements 表）",
+                self.export_sqlite,
+            )
+        if self.export_sqlite_upsert is not None:
+            self._check_row(
+                form,
+                "SQLite は作り直さず、出力先フォルダの steam_achievements.sqlite3 に変わった分だけ反映する",
+                self.export_sqlite_upsert,
+            )
+        if self.export_xlsx is not None:
+            self._check_row(
+                form,
+                "Excel ブック（.xlsx）も書き出す",
+                self.export_xlsx,
+            )
+        if self.export_xlsx_per_game is not None:
+            self._check_row(
+                form,
+                "Excel はゲームごとにシートを分ける（オフ: 1シートにまとめる）",
+                self.export_xlsx_per_game,
+            )
+
 
         # ---------------------------------------------------------
         # 下部説明
@@ -359,6 +511,17 @@ class SettingsPage(tk.Frame):
         self.steam_id.trace_add("write", _on_change)
         self.steam_path.trace_add("write", _on_change)
         self.output_path.trace_add("write", _on_change)
+        if self.prefer_local is not None:
+            self.prefer_local.trace_add("write", _on_change)
+        if self.offline_mode is not None:
+            self.offline_mode.trace_add("write", _on_change)
+        if self.background_warm is not None:
+            self.background_warm.trace_add("write", _on_change)
+        for var in (self.export_jsonl, self.export_sqlite, self.export_sqlite_upsert,
+                    self.export_xlsx, self.export_xlsx_per_game, self.export_per_game,
+                    self.export_compress):
+            if var is not None:
+                var.trace_add("write", _on_change)
 
         # Steam パスの状態表示
         self.steam_path.trace_add("write", lambda *_: self._update_steam_status())
@@ -436,3 +599,21 @@ class SettingsPage(tk.Frame):
             self.output_path.set(path)
             if self.save_config_callback:
                 self.save_config_callback()
+
+    def _choose_cache_export(self):
+        path = filedialog.asksaveasfilename(
+            title="キャッシュの書き出し先を選択",
+            defaultextension=".jsonl.gz",
+            filetypes=[("Cache Snapshot", "*.jsonl.gz")],
+            initialfile="steam_cache_snapshot.jsonl.gz",
+        )
+        if path:
+            self.export_cache_callback(path)
+
+    def _choose_cache_import(self):
+        path = filedialog.askopenfilename(
+            title="取り込むキャッシュを選択",
+            filetypes=[("Cache Snapshot", "*.jsonl.gz"), ("All Files", "*.*")],
+        )
+        if path:
+            self.import_cache_callback(path)
@@ -7,6 +7,8 @@ import json
 import threading
 import re   # ★ 禁止文字除去に必要
 import html  # ★ HTMLエンティティのデコードなどに使用
+import codecs
+from html.parser import HTMLParser
 from typing import Optional, Dict
 from settings_page import SettingsPage
 
@@ -14,75 +16,912 @@ import sys
 import requests
 import struct
 import platform
+import sqlite3
+import zlib
+import zipfile
+import queue
 from pathlib import Path
+from collections import OrderedDict, namedtuple
+from operator import itemgetter
+from concurrent.futures import Future
 
-def fetch_game_title_prefer_jp(appid: int, timeout: int = 10):
+# -----------------------------
+# HTTP（すべての Steam へのリクエストはここを通す）
+# -----------------------------
+_HTTP_COUNTER = threading.local()
+
+def _http_request_count() -> int:
+    """このスレッドが発行した HTTP リクエスト数（キャッシュヒットは含まない）。"""
+    return int(getattr(_HTTP_COUNTER, "n", 0))
+
+
+class FetchCancelled(BaseException):
+    """CancelToken で中断された。
+
+    各取得関数の `except Exception`（= ソースが空だった扱い）に拾われて
+    ネガティブキャッシュや補完ソースの統計を汚さないよう、BaseException から派生させる。
+    """
+
+
+class CancelToken:
+    """プレビューなどの取得処理を途中で打ち切るためのトークン。
+
+    cancel() 後、そのトークンのもとで動いているスレッドは次の HTTP リクエストを発行する前に
+    FetchCancelled で抜ける（レート制限の待ち中でもすぐ抜ける）。
+    parent を渡すと、parent が中断されたときもこのトークンは中断された扱いになる。
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self) -> None:
+        self._event.set()
+        _RATE_LIMITER.wake()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise FetchCancelled()
+
+
+def _current_cancel_token() -> Optional[CancelToken]:
+    return getattr(_HTTP_COUNTER, "cancel", None)
+
+class _cancel_scope:
+    """with _cancel_scope(token): の間、このスレッドの HTTP リクエストは token で中断できる。
+
+    token=None のときは外側のスコープのトークンをそのまま使う。
+    """
+
+    def __init__(self, token: Optional[CancelToken]):
+        self.token = token
+
+    def __enter__(self):
+        self._prev = _current_cancel_token()
+        if self.token is not None:
+            _HTTP_COUNTER.cancel = self.token
+        return _current_cancel_token()
+
+    def __exit__(self, *exc):
+        _HTTP_COUNTER.cancel = self._prev
+        return False
+
+
+# 優先度（小さいほど先）。レート制限の順番待ちと共有ワーカーの実行順の両方に使う
+PRIORITY_PREVIEW = 0    # プレビュー（クリックした結果をすぐ見せる）
+PRIORITY_EXPORT = 1     # Export
+PRIORITY_TITLE = 2      # 日本語タイトルの補完
+PRIORITY_PREFETCH = 3   # キャッシュ / プレビューの先読み
+
+def _priority_cell() -> list:
+    """このスレッドの優先度（single-flight で他スレッドから引き上げられるよう1要素のリストで持つ）。"""
+    cell = getattr(_HTTP_COUNTER, "priority", None)
+    if cell is None:
+        # スコープ外（GUI スレッドなど）は操作中の処理として扱う
+        cell = [PRIORITY_PREVIEW]
+        _HTTP_COUNTER.priority = cell
+    return cell
+
+def _current_priority() -> int:
+    return _priority_cell()[0]
+
+
+class _RateLimiter:
+    """アプリ全体で共有するトークンバケット（1秒あたり rate 回、最大 burst 回まで連続）。
+
+    待っているリクエストには優先度順（同じ優先度は到着順）に枠を渡す。
+    Export / タイトル補完はバケットの 2 割、先読みは半分を残し、プレビューが来たときに
+    待たずに出せるようにする。先読みは、それより優先度の高い処理が動いている間は待つ。
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._seq = 0
+        self._waiters = []  # [(priority_cell, seq)]
+        self._active: Dict[int, int] = {}  # priority -> 実行中の数
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def _higher_active(self, priority: int) -> bool:
+        return any(n for p, n in self._active.items() if p < priority)
+
+    def acquire(self, cell: Optional[list] = None, cancel: Optional[CancelToken] = None) -> None:
+        cell = cell if cell is not None else [PRIORITY_PREVIEW]
+        with self._cond:
+            self._seq += 1
+            me = (cell, self._seq)
+            self._waiters.append(me)
+            try:
+                while True:
+                    # 待っている間に不要になったリクエストは枠を使わずに抜ける
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    priority = cell[0]
+                    background = priority >= PRIORITY_PREFETCH
+                    if background and self._higher_active(priority):
+                        self._cond.wait(0.5)
+                        continue
+                    head = min(self._waiters, key=lambda w: (w[0][0], w[1]))
+                    if head is not me:
+                        self._cond.wait(0.5)
+                        continue
+                    if priority <= PRIORITY_PREVIEW:
+                        reserve = 0
+                    else:
+                        reserve = self.burst / 2 if background else self.burst * 0.2
+                    self._refill()
+                    if self._tokens >= 1 + reserve:
+                        self._tokens -= 1
+                        return
+                    self._cond.wait((1 + reserve - self._tokens) / self.rate)
+            finally:
+                self._waiters.remove(me)
+                self._cond.notify_all()
+
+    def wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def configure(self, rate: float) -> None:
+        with self._cond:
+            self.rate = max(0.1, float(rate))
+            self._cond.notify_all()
+
+    def enter(self, priority: int) -> None:
+        with self._cond:
+            self._active[priority] = self._active.get(priority, 0) + 1
+
+    def leave(self, priority: int) -> None:
+        with self._cond:
+            self._active[priority] = max(0, self._active.get(priority, 0) - 1)
+            self._cond.notify_all()
+
+
+# 1秒あたりのリクエスト数は config.json の "requests_per_second" で変更できる
+_RATE_LIMITER = _RateLimiter(rate=10, burst=10)
+
+class _priority_scope:
+    """with _priority_scope(PRIORITY_xxx): の間、このスレッドのリクエストはその優先度で順番待ちする。"""
+
+    def __init__(self, priority: int):
+        self.priority = priority
+
+    def __enter__(self):
+        self._prev = getattr(_HTTP_COUNTER, "priority", None)
+        _HTTP_COUNTER.priority = [self.priority]
+        _RATE_LIMITER.enter(self.priority)
+        return self
+
+    def __exit__(self, *exc):
+        _RATE_LIMITER.leave(self.priority)
+        _HTTP_COUNTER.priority = self._prev
+        return False
+
+# 中断を確認する間隔（秒）
+CANCEL_POLL_SECONDS = 0.05
+
+def _http_get(url: str, **kwargs):
+    cancel = _current_cancel_token()
+    _RATE_LIMITER.acquire(_priority_cell(), cancel=cancel)
+    _HTTP_COUNTER.n = _http_request_count() + 1
+    if cancel is None:
+        return requests.get(url, **kwargs)
+    return _cancellable_get(cancel, url, **kwargs)
+
+def _cancellable_get(cancel: CancelToken, url: str, **kwargs):
+    """送信中のリクエストも中断できる requests.get。
+
+    requests はブロッキング中の呼び出しを外から止められないため、別スレッドで実行して
+    こちらは CANCEL_POLL_SECONDS ごとに中断を確認する。中断した場合は応答を待たずに抜け、
+    遅れて届いた応答は捨てる（そのスレッドはタイムアウトまでに自然に終わる）。
+    """
+    box = {}
+    done = threading.Event()
+
+    def run():
+        try:
+            box["resp"] = requests.get(url, **kwargs)
+        except BaseException as e:
+            box["error"] = e
+        done.set()
+        if cancel.cancelled and "resp" in box:
+            try:
+                box["resp"].close()
+            except Exception:
+                pass
+
+    threading.Thread(target=run, name="steam-http", daemon=True).start()
+    while not done.wait(CANCEL_POLL_SECONDS):
+        cancel.raise_if_cancelled()
+    if "error" in box:
+        raise box["error"]
+    return box["resp"]
+
+def _cancellable_iter(chunks):
+    """ストリーミング読み込みを、チャンクごとに中断を確認しながら回す。"""
+    cancel = _current_cancel_token()
+    for chunk in chunks:
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        yield chunk
+
+
+# -----------------------------
+# 共有ワーカー（プレビュー / Export / タイトル補完 / 先読みのジョブをまとめて実行）
+# -----------------------------
+class _Scheduler:
+    """優先度付きの共有ワーカープール。
+
+    優先度の小さいジョブから実行し、同じ優先度は投入順。待ち時間 AGING_SECONDS ごとに
+    1段ずつ繰り上げて、低い優先度のジョブも止まったままにならないようにする。
+    1スレッドはプレビュー専用に空けておき、Export 中のクリックでもすぐ取りかかれるようにする。
+    ジョブは小さく（1ゲーム単位で）投入すること。
+    """
+
+    AGING_SECONDS = 5.0
+
+    def __init__(self, workers: int = 4, reserved: int = 1):
+        self.workers = max(2, int(workers))
+        self.reserved = max(0, min(int(reserved), self.workers - 1))
+        self._cond = threading.Condition()
+        self._queue = []  # [(priority, seq, 投入時刻, future, fn, args, cancel)]
+        self._seq = 0
+        self._running_low = 0  # 実行中のプレビュー以外のジョブ数
+        self._started = False
+
+    def submit(self, priority: int, fn, *args, cancel: Optional[CancelToken] = None) -> Future:
+        fut = Future()
+        with self._cond:
+            if not self._started:
+                for i in range(self.workers):
+                    threading.Thread(target=self._run, name=f"steam-worker-{i}", daemon=True).start()
+                self._started = True
+            self._seq += 1
+            self._queue.append((int(priority), self._seq, time.monotonic(), fut, fn, args, cancel))
+            self._cond.notify()
+        return fut
+
+    def _pick(self):
+        now = time.monotonic()
+        low_allowed = self._running_low < self.workers - self.reserved
+        best = None
+        best_key = None
+        for job in self._queue:
+            priority, seq, queued = job[0], job[1], job[2]
+            if priority > PRIORITY_PREVIEW and not low_allowed:
+                continue
+            effective = max(PRIORITY_PREVIEW, priority - int((now - queued) / self.AGING_SECONDS))
+            key = (effective, seq)
+            if best_key is None or key < best_key:
+                best, best_key = job, key
+        return best
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = self._pick()
+                while job is None:
+                    self._cond.wait()
+                    job = self._pick()
+                self._queue.remove(job)
+                priority, _seq, _queued, fut, fn, args, cancel = job
+                low = priority > PRIORITY_PREVIEW
+                if low:
+                    self._running_low += 1
+
+            try:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                if cancel is not None and cancel.cancelled:
+                    fut.set_exception(FetchCancelled())
+                    continue
+                try:
+                    with _priority_scope(priority), _cancel_scope(cancel):
+                        result = fn(*args)
+                except BaseException as e:
+                    fut.set_exception(e)
+                else:
+                    fut.set_result(result)
+            finally:
+                if low:
+                    with self._cond:
+                        self._running_low -= 1
+                        self._cond.notify_all()
+
+
+# 同時実行数（うち1つはプレビュー専用）
+_SCHEDULER = _Scheduler(workers=4, reserved=1)
+
+
+def _run_alongside(fn, *args) -> Future:
+    """fn を専用のスレッドで並行に実行する。優先度と中断トークンは呼び出し元のものを引き継ぐ。
+
+    共有ワーカーのジョブの中から、そのジョブの処理と重ねたい小さな取得に使う
+    （ジョブの中で _SCHEDULER のジョブを待つと、ワーカーが埋まったときに詰まるため）。
+    """
+    fut = Future()
+    priority = _current_priority()
+    cancel = _current_cancel_token()
+
+    def run():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            with _priority_scope(priority), _cancel_scope(cancel):
+                fut.set_result(fn(*args))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return fut
+
+
+# -----------------------------
+# 同時リクエストのまとめ（single-flight）
+# -----------------------------
+class _LeaderCancelled(Exception):
+    """single-flight の実行側が中断された（待っていた側はやり直す）。"""
+
+
+class _SingleFlight:
+    """同じキーの処理がすでに実行中なら、新たに実行せず完了を待って同じ結果を返す。
+
+    プレビュー / タイトル補完 / Export の各スレッドが同じ AppID を同時に要求したときに、
+    HTTP リクエストを1回にまとめるために使う。完了後の結果は保持しない（キャッシュは別）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """(result, shared) を返す。shared=True は他スレッドの実行結果を受け取った場合。
+
+        実行していたスレッドが中断（FetchCancelled）された場合、待っていた側は自分で実行し直す。
+        """
+        while True:
+            try:
+                return self._do(key, fn)
+            except _LeaderCancelled:
+                continue
+
+    def in_flight(self, key) -> bool:
+        """同じキーの処理が実行中か。"""
+        with self._lock:
+            return key in self._calls
+
+    def _do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                cell = _priority_cell()
+                call = {"event": threading.Event(), "result": None, "error": None, "cell": cell, "priority": cell[0]}
+                self._calls[key] = call
+            elif _current_priority() < call["cell"][0]:
+                # 優先度の低い処理（先読みなど）の結果を待つ場合は、実行側の優先度を引き上げる
+                # （引き上げないと、こちらが動いている限り先読みが進まず互いに待ち合ってしまう）
+                call["cell"][0] = _current_priority()
+                _RATE_LIMITER.wake()
+
+        if not leader:
+            # 自分が中断されたら、実行側の完了を待たずに抜ける
+            cancel = _current_cancel_token()
+            if cancel is None:
+                call["event"].wait()
+            else:
+                while not call["event"].wait(CANCEL_POLL_SECONDS):
+                    cancel.raise_if_cancelled()
+            if isinstance(call["error"], FetchCancelled):
+                token = _current_cancel_token()
+                if token is not None:
+                    token.raise_if_cancelled()
+                raise _LeaderCancelled()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+
+        try:
+            call["result"] = fn()
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                call["cell"][0] = call["priority"]
+            call["event"].set()
+        return call["result"], False
+
+_SINGLE_FLIGHT = _SingleFlight()
+
+
+def _fetch_game_title(appid: int, timeout: int = 10):
+    """(title, definitive) を返す。
+    definitive=True は「すべての言語で Store API が正常に応答したうえで名前が無かった」
+    （配信終了/リージョン制限など）で、通信エラーが混ざったときは False。
+    """
     base = "https://store.steampowered.com/api/appdetails?appids={appid}&l={lang}"
+    definitive = True
     for lang in ("japanese", "english"):
         url = base.format(appid=appid, lang=lang)
         try:
-            r = requests.get(url, timeout=timeout)
+            r = _http_get(url, timeout=timeout)
             r.raise_for_status()
             data = r.json()
         except Exception:
+            definitive = False
             continue
 
-        block = data.get(str(appid), {})
+        block = (data or {}).get(str(appid), {}) or {}
         if not block.get("success"):
             continue
 
         app = block.get("data") or {}
         name = app.get("name")
         if isinstance(name, str) and name.strip():
-            return name.strip()
-    return None
+            return name.strip(), True
+    return None, definitive
 
+def fetch_game_title_prefer_jp(appid: int, timeout: int = 10):
+    title, _definitive = _fetch_game_title(appid, timeout=timeout)
+    return title
 
 
 # -----------------------------
-# タイトル取得（日本語優先 + キャッシュ）
+# キャッシュ DB（SQLite / WAL）
 # -----------------------------
-_TITLE_CACHE_LOCK = threading.Lock()
-_TITLE_CACHE = None  # type: Optional[dict]
+# タイトル・ネガティブキャッシュ・ローカル schema の解析結果・補完ソースの当たり外れ・
+# Web API の応答（schema / master / community / status）をすべて1つの DB に保存する。
+#   - namespace ごとに TTL（CACHE_TTLS）
+#   - 値は JSON を zlib 圧縮して保存
+#   - 合計サイズが上限を超えたら最後に使われた時刻が古いものから削除（LRU）
+#   - 接続はスレッドごと（WAL なので読み書きが並行できる）
+class _CacheStore:
+    # accessed の更新はこの秒数より古いときだけ（読み取りのたびに書き込まないため）
+    TOUCH_INTERVAL = 60.0
+    # 何回書き込むごとにサイズ上限をチェックするか
+    EVICT_CHECK_EVERY = 200
+
+    def __init__(self, path: str, max_bytes: int, ttls: Optional[dict] = None, pinned=()):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.ttls = dict(ttls or {})
+        # サイズ上限で追い出さない名前空間（取り直せない記録）
+        self.pinned = tuple(pinned)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._writes = 0
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " ns TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, created REAL NOT NULL, expires REAL, accessed REAL NOT NULL,"
+                " PRIMARY KEY (ns, key)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+            conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
 
-def _load_title_cache() -> dict:
-    try:
-        with open(TITLE_CACHE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+    @staticmethod
+    def _encode(value) -> bytes:
+        return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+    @staticmethod
+    def _decode(blob: bytes):
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def _count(self, ns: str, hit: bool):
+        with self._stats_lock:
+            d = self._hits if hit else self._misses
+            d[ns] = d.get(ns, 0) + 1
+
+    def get(self, ns: str, key, default=None):
+        """期限内の値を返す。無ければ default。"""
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value, expires, accessed FROM cache WHERE ns = ? AND key = ?", (ns, str(key))
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._count(ns, False)
+                return default
+            value = self._decode(row[0])
+            if now - float(row[2]) > self.TOUCH_INTERVAL:
+                with conn:
+                    conn.execute("UPDATE cache SET accessed = ? WHERE ns = ? AND key = ?", (now, ns, str(key)))
+        except Exception:
+            # キャッシュは補助機能なので読めなくても落とさない
+            self._count(ns, False)
+            return default
+        self._count(ns, True)
+        return value
+
+    def set(self, ns: str, key, value, ttl: Optional[float] = -1):
+        """ttl=-1 は namespace の既定値、None は無期限。"""
+        self.set_many(ns, [(key, value)], ttl=ttl)
+
+    def set_many(self, ns: str, items, ttl: Optional[float] = -1):
+        """複数件を1トランザクションで書き込む。"""
+        if ttl == -1:
+            ttl = self.ttls.get(ns)
+        now = time.time()
+        expires = (now + float(ttl)) if ttl is not None else None
+        rows = []
+        for key, value in items:
+            blob = self._encode(value)
+            rows.append((ns, str(key), blob, len(blob), now, expires, now))
+        if not rows:
+            return
+        try:
+            conn = self._conn()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        except Exception:
+            return
+        with self._stats_lock:
+            before = self._writes
+            self._writes += len(rows)
+            check = before // self.EVICT_CHECK_EVERY != self._writes // self.EVICT_CHECK_EVERY
+        if check:
+            self.evict()
+
+    def delete(self, ns: str, key):
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("DELETE FROM cache WHERE ns = ? AND key = ?", (ns, str(key)))
+        except Exception:
+            pass
+
+    def items(self, ns: str):
+        """期限内の (key, value) を列挙する。"""
+        now = time.time()
+        try:
+            cur = self._conn().execute(
+                "SELECT key, value FROM cache WHERE ns = ? AND (expires IS NULL OR expires > ?)", (ns, now)
+            )
+            for key, blob in cur:
+                try:
+                    yield key, self._decode(blob)
+                except Exception:
+                    continue
+        except Exception:
+            return
+
+    def rows(self, ns: str):
+        """期限内の (key, value, created, expires) を列挙する（スナップショット用）。"""
+        now = time.time()
+        try:
+            cur = self._conn().execute(
+                "SELECT key, value, created, expires FROM cache WHERE ns = ? AND (expires IS NULL OR expires > ?)",
+                (ns, now),
+            )
+            for key, blob, created, expires in cur:
+                try:
+                    yield key, self._decode(blob), created, expires
+                except Exception:
+                    continue
+        except Exception:
+            return
+
+    def merge_many(self, ns: str, rows) -> int:
+        """(key, value, created, expires) を取り込む。手元に新しいものがあれば上書きしない。
 
-def _save_title_cache(cache: dict) -> None:
+        取り込んだ件数を返す。
+        """
+        now = time.time()
+        batch = []
+        for key, value, created, expires in rows:
+            if expires is not None and float(expires) <= now:
+                continue
+            blob = self._encode(value)
+            batch.append((ns, str(key), blob, len(blob), float(created), expires, now))
+        if not batch:
+            return 0
+        conn = self._conn()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO cache VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(ns, key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, created = excluded.created, "
+                "expires = excluded.expires, accessed = excluded.accessed "
+                "WHERE excluded.created > cache.created OR (cache.expires IS NOT NULL AND cache.expires <= ?)",
+                [row + (now,) for row in batch],
+            )
+            merged = conn.total_changes - before
+        self.evict()
+        return merged
+
+    def total_bytes(self) -> int:
+        try:
+            row = self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+            return int(row[0] or 0)
+        except Exception:
+            return 0
+
+    def evict(self) -> int:
+        """期限切れを消し、合計サイズが上限の 90% に収まるまで古いものから削除する。削除件数を返す。
+
+        pinned の名前空間はサイズ上限では削除しない。
+        """
+        removed = 0
+        try:
+            conn = self._conn()
+            with conn:
+                removed += conn.execute(
+                    "DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+                ).rowcount
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return removed
+            target = int(self.max_bytes * 0.9)
+            victims = []
+            marks = ",".join("?" * len(self.pinned))
+            where = f" WHERE ns NOT IN ({marks})" if self.pinned else ""
+            rows = conn.execute(f"SELECT ns, key, size FROM cache{where} ORDER BY accessed", self.pinned)
+            for ns, key, size in rows:
+                if total <= target:
+                    break
+                victims.append((ns, key))
+                total -= int(size)
+            with conn:
+                conn.executemany("DELETE FROM cache WHERE ns = ? AND key = ?", victims)
+            removed += len(victims)
+        except Exception:
+            pass
+        return removed
+
+    def stats(self) -> dict:
+        """{"hits": {ns: n}, "misses": {ns: n}, "bytes": 合計サイズ}"""
+        with self._stats_lock:
+            return {"hits": dict(self._hits), "misses": dict(self._misses), "bytes": self.total_bytes()}
+
+
+def _approx_size(value) -> int:
+    """メモリ上のおおよそのサイズ（バイト）。予算管理用の見積もりで、厳密さは求めない。"""
+    if isinstance(value, str):
+        return 50 + len(value) * (1 if value.isascii() else 2)
+    if isinstance(value, dict):
+        return 64 + sum(_approx_size(k) + _approx_size(v) + 16 for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(_approx_size(v) + 8 for v in value)
+    return 32
+
+
+class _MemoryLRU:
+    """プロセス内の LRU キャッシュ（おおよそのバイト数で上限を持つ）。
+
+    キャッシュ DB の手前に置き、追い出された値は次回 DB から読み直す
+    （ネットワークまでは戻らない）。
+    """
+
+    def __init__(self, name: str, config_key: str, default_mb: float):
+        self.name = name
+        self._config_key = config_key
+        self._default_mb = default_mb
+        self._max_bytes = None  # 初回 put 時に config.json から決める
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value) -> None:
+        size = _approx_size(value)
+        max_bytes = self.max_bytes()
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > max_bytes:
+                return  # 1件で予算を超えるものは載せない（DB から毎回読む）
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._bytes > max_bytes and self._data:
+                _k, (_v, sz) = self._data.popitem(last=False)
+                self._bytes -= sz
+                self.evictions += 1
+
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            try:
+                mb = float(_read_config_value(self._config_key, self._default_mb))
+            except Exception:
+                mb = self._default_mb
+            self._max_bytes = int(max(mb, 0) * 1024 * 1024)
+        return self._max_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_CACHE_STORE_LOCK = threading.Lock()
+_CACHE_STORE = None  # type: Optional[_CacheStore]
+
+def _read_config_value(key: str, default=None):
     try:
-        with open(TITLE_CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            cfg = json.load(f) or {}
+        return cfg.get(key, default)
     except Exception:
-        # キャッシュは補助機能なので保存失敗しても落とさない
-        pass
+        return default
+
+def _cache() -> _CacheStore:
+    """キャッシュ DB（初回呼び出し時に開き、旧 JSON キャッシュがあれば取り込む）。"""
+    global _CACHE_STORE
+    with _CACHE_STORE_LOCK:
+        if _CACHE_STORE is None:
+            try:
+                max_mb = float(_read_config_value("cache_max_mb", CACHE_DB_MAX_MB))
+            except Exception:
+                max_mb = CACHE_DB_MAX_MB
+            _CACHE_STORE = _CacheStore(CACHE_DB_PATH, int(max_mb * 1024 * 1024), CACHE_TTLS,
+                                       pinned=CACHE_PINNED_NAMESPACES)
+            _migrate_json_caches(_CACHE_STORE)
+        return _CACHE_STORE
+
+def _migrate_json_caches(store: _CacheStore) -> None:
+    """以前のバージョンの JSON キャッシュを1回だけ DB に取り込む（元ファイルはそのまま残す）。"""
+    if store.get("meta", "json_migrated"):
+        return
+
+    def _load(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    titles = _load(LEGACY_TITLE_CACHE_PATH)
+    store.set_many("title", [(k, v) for k, v in titles.items() if isinstance(v, str) and v.strip()])
+
+    now = time.time()
+    for ns, entries in _load(LEGACY_NEGATIVE_CACHE_PATH).items():
+        if isinstance(entries, dict):
+            for k, expires in entries.items():
+                if isinstance(expires, (int, float)) and expires > now:
+                    store.set("neg:" + ns, k, 1, ttl=expires - now)
+
+    schemas = _load(LEGACY_LOCAL_SCHEMA_STORE_PATH)
+    store.set_many("local_schema", [(k, v) for k, v in schemas.items() if isinstance(v, dict)])
+
+    stats = _load(LEGACY_SOURCE_STATS_PATH)
+    store.set_many("source_stats", [(k, v) for k, v in stats.items() if isinstance(v, dict)])
+
+    store.set("meta", "json_migrated", True, ttl=None)
+
+def cache_stats_summary() -> str:
+    """ログ表示用: キャッシュのヒット/ミス数と DB サイズ。"""
+    st = _cache().stats()
+    hits = sum(st["hits"].values())
+    misses = sum(st["misses"].values())
+    mem = []
+    for lru in (_TITLE_MEMORY, _LOCAL_SCHEMA_CACHE, _PREVIEW_CACHE):
+        m = lru.stats()
+        mem.append(f"{lru.name} {m['entries']}件 {m['bytes'] / 1024 / 1024:.1f} MB 追い出し {m['evictions']}")
+    return (
+        f"キャッシュ: ヒット {hits} / ミス {misses}（DB {st['bytes'] / 1024 / 1024:.1f} MB）"
+        f" / メモリ: " + "、".join(mem)
+    )
+
+
+# -----------------------------
+# ネガティブキャッシュ（「無い」ことを TTL 付きで覚えておく）
+# -----------------------------
+# キャッシュ DB の "neg:<namespace>" に保存する。
+#   "title"           : Store API でタイトルが取れない AppID（配信終了/リージョン制限など）
+#   "no_achievements" : GetPlayerAchievements に実績が無い AppID
+def _negative_cache_hit(namespace: str, key) -> bool:
+    return bool(_cache().get("neg:" + namespace, str(key)))
+
+def _negative_cache_put(namespace: str, key, ttl: float) -> None:
+    _cache().set("neg:" + namespace, str(key), 1, ttl=ttl)
+
+
+# -----------------------------
+# タイトル取得（日本語優先 + キャッシュ）
+# -----------------------------
+# 一覧の再描画などで何度も引かれるので DB の手前にメモリ LRU を置く
+# （上限は config.json の "title_memory_mb"、既定 4 MB）
+_TITLE_MEMORY = _MemoryLRU("タイトル", "title_memory_mb", 4)
+
+def get_cached_game_title(appid: int) -> Optional[str]:
+    """キャッシュ済みのタイトルだけを返す（ネットワークは使わない）。"""
+    key = str(appid)
+    cached = _TITLE_MEMORY.get(key)
+    if cached:
+        return cached
+    cached = _cache().get("title", key)
+    if isinstance(cached, str) and cached.strip():
+        _TITLE_MEMORY.put(key, cached.strip())
+        return cached.strip()
+    return None
 
-def get_game_title_prefer_jp_cached(appid: int, timeout: int = 10) -> Optional[str]:
-    """Store API から日本語→英語の順でタイトルを取得し、結果をキャッシュする。"""
-    global _TITLE_CACHE
+def get_game_title_prefer_jp_cached(appid: int, timeout: int = 10, cancel: Optional[CancelToken] = None) -> Optional[str]:
+    """Store API から日本語→英語の順でタイトルを取得し、結果をキャッシュする。
+    取れなかった AppID は TITLE_NEGATIVE_TTL の間は問い合わせない。
+    """
     key = str(appid)
 
-    with _TITLE_CACHE_LOCK:
-        if _TITLE_CACHE is None:
-            _TITLE_CACHE = _load_title_cache()
-        cached = _TITLE_CACHE.get(key)
-        if isinstance(cached, str) and cached.strip():
-            return cached.strip()
-
-    title = fetch_game_title_prefer_jp(appid, timeout=timeout)
-    if isinstance(title, str) and title.strip():
-        with _TITLE_CACHE_LOCK:
-            if _TITLE_CACHE is None:
-                _TITLE_CACHE = {}
-            _TITLE_CACHE[key] = title.strip()
-            _save_title_cache(_TITLE_CACHE)
+    cached = get_cached_game_title(appid)
+    if cached:
+        return cached
+
+    if _negative_cache_hit("title", key):
+        return None
+
+    def fetch():
+        # 待っている間に他スレッドが取得済みかもしれない
+        cached_title = get_cached_game_title(appid)
+        if cached_title:
+            return cached_title
+
+        title, definitive = _fetch_game_title(appid, timeout=timeout)
+        if not (isinstance(title, str) and title.strip()):
+            # 通信エラーのときは覚えない（次回また試す）
+            if definitive:
+                _negative_cache_put("title", key, TITLE_NEGATIVE_TTL)
+            return None
+
+        _cache().set("title", key, title.strip())
+        _TITLE_MEMORY.put(key, title.strip())
         return title.strip()
 
-    return None
+    with _cancel_scope(cancel):
+        title, _shared = _SINGLE_FLIGHT.do(("title", key), fetch)
+    return title
 
 def resource_path(relative_path):
     """PyInstaller で exe 化した後でもリソースファイルにアクセスできるようにする"""
@@ -99,8 +938,52 @@ CONFIG_PATH = "config.json"
 APP_TITLE = "Steam 実績エクスポーター"
 DEFAULT_OUTPUT = os.path.join("C:\\", "steam_export", "steam_achievements_jp.csv")
 USE_JP_TITLE = True
-# 日本語タイトルのキャッシュ（Store API 連打を避ける）
-TITLE_CACHE_PATH = "title_cache.json"
+# オフライン Export の「欠落」列に出す名前
+OFFLINE_MISSING_LABELS = {"title": "タイトル", "status": "取得状況", "description": "説明"}
+# キャッシュ DB（タイトル / ローカル schema / Web API の応答などをまとめて保存）
+CACHE_DB_PATH = "steam_cache.sqlite3"
+# DB の容量上限（MB）。config.json の "cache_max_mb" で変更できる
+CACHE_DB_MAX_MB = 256
+# プレビューのメモリキャッシュの有効期限（取得状況のキャッシュと同じ 5 分）と先読みの範囲
+PREVIEW_CACHE_TTL = 5 * 60
+PREVIEW_PREFETCH_NEIGHBORS = 2
+PREVIEW_PREFETCH_MAX = 8
+# Export の段と段の間に溜めておけるゲーム数（ライブラリの大きさに関係なくメモリ使用量を一定に保つ）
+EXPORT_QUEUE_DEPTH = 8
+# CSV はこの行数ずつまとめて書く。ファイル側のバッファ（バイト）も大きめに取る
+EXPORT_WRITE_BATCH = 4096
+EXPORT_FILE_BUFFER = 1 << 20
+# CSV / JSON Lines の圧縮（config.json の "export_compression" = "gzip" / "zstd"、"export_compression_level"）
+EXPORT_COMPRESSION_DEFAULT = "gzip"
+# 「無い」ことのキャッシュ（タイトルが取れない / 実績が無い AppID を毎回問い合わせない）
+TITLE_NEGATIVE_TTL = 3 * 24 * 3600
+NO_ACHIEVEMENTS_NEGATIVE_TTL = 24 * 3600
+# namespace ごとの有効期限（秒 / None = 無期限）
+CACHE_TTLS = {
+    "title": None,                    # 日本語タイトル（Store API 連打を避ける）
+    "local_schema": None,             # UserGameStatsSchema_*.bin の解析結果（フィンガープリントで鮮度判定）
+    "local_schema_seed": None,        # 他のPCから取り込んだ解析結果（AppID キー、.bin が無いときに使う）
+    "source_stats": None,             # ゲームごとの補完ソースの当たり外れ
+    "schema": 7 * 24 * 3600,          # GetSchemaForGame
+    "master": 7 * 24 * 3600,          # IPlayerService/GetGameAchievements
+    "community": 3 * 24 * 3600,       # Community の Global Achievements ページ
+    "global_percent": 24 * 3600,      # GetGlobalAchievementPercentagesForApp（全体の取得率）
+    "status": 5 * 60,                 # GetPlayerAchievements（取得状況は変わるので短め）
+    "unlock": 5 * 60,                 # 同じ応答の解除日時（JSON Lines / SQLite 出力用）
+    "meta": None,
+}
+# サイズ上限を超えても追い出さない名前空間（消えると取り直せない / 旧 JSON の再取り込みが起きる）
+CACHE_PINNED_NAMESPACES = ("meta", "source_stats", "local_schema_seed")
+# 以前のバージョンの JSON キャッシュ（初回起動時に DB へ取り込む）
+LEGACY_TITLE_CACHE_PATH = "title_cache.json"
+LEGACY_NEGATIVE_CACHE_PATH = "negative_cache.json"
+LEGACY_LOCAL_SCHEMA_STORE_PATH = "local_schema_cache.json"
+LEGACY_SOURCE_STATS_PATH = "source_stats.json"
+# 連続でこの回数だけ外れたソースは、そのゲームでは再調査時期まで取得しない
+SOURCE_FUTILE_STREAK = 2
+# 再調査の間隔（外れが続くほど倍々に延ばし、上限で頭打ち）
+SOURCE_REPROBE_SECONDS = 7 * 24 * 3600
+SOURCE_REPROBE_MAX_SECONDS = 60 * 24 * 3600
 
 # カラー
 BG_ROOT = "#232120"
@@ -131,7 +1014,7 @@ def safe_filename(name: str) -> str:
 # -----------------------------
 # API
 # -----------------------------
-def get_owned_games(api_key, steam_id):
+def get_owned_games(api_key, steam_id, cancel: Optional[CancelToken] = None):
     if not api_key or not steam_id:
         raise ValueError("API Key と SteamID64 を設定タブで入力してください。")
 
@@ -140,7 +1023,8 @@ def get_owned_games(api_key, steam_id):
         f"?key={api_key}&steamid={steam_id}"
         "&include_appinfo=1&include_played_free_games=1"
     )
-    resp = requests.get(url, timeout=15)
+    with _cancel_scope(cancel):
+        resp = _http_get(url, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     return data.get("response", {}).get("games", [])
@@ -150,23 +1034,40 @@ def get_owned_games(api_key, steam_id):
 # 実績：追加情報（hidden説明の補完）
 # -----------------------------
 
-def get_game_achievements_master(api_key: str, appid: int, lang: str = "japanese", timeout: int = 15) -> dict:
+def get_game_achievements_master(api_key: str, appid: int, lang: str = "japanese", timeout: int = 15,
+                                 cancel: Optional[CancelToken] = None) -> dict:
     """hidden でも description が入ることがある master を取得（apiname -> {displayName, description}）。
     非公式寄りだが広く使われている IPlayerService/GetGameAchievements を試す。
+    通信 / HTTP エラーは例外のまま送出する（補完計画が「外れ」と区別して記録するため）。
     """
     if not api_key:
         return {}
+    cache_key = f"{int(appid)}:{lang}"
+    cached = _cache().get("master", cache_key)
+    if isinstance(cached, dict):
+        return cached
+
+    def fetch():
+        out = _fetch_game_achievements_master(api_key, appid, lang, timeout)
+        # 空は通信エラーと区別できないので保存しない
+        if out:
+            _cache().set("master", cache_key, out)
+        return out
+
+    with _cancel_scope(cancel):
+        out, _shared = _SINGLE_FLIGHT.do(("master", int(appid), lang), fetch)
+    return dict(out)
+
+
+def _fetch_game_achievements_master(api_key: str, appid: int, lang: str, timeout: int) -> dict:
 
     url = (
         "https://api.steampowered.com/IPlayerService/GetGameAchievements/v1/"
         f"?key={api_key}&appid={appid}&language={lang}"
     )
-    try:
-        resp = requests.get(url, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json() or {}
-    except Exception:
-        return {}
+    resp = _http_get(url, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json() or {}
 
     # 形式が複数あり得るので安全に辿る
     container = data.get("response") or data
@@ -184,60 +1085,298 @@ def get_game_achievements_master(api_key: str, appid: int, lang: str = "japanese
     return out
 
 
-def get_global_achievement_descriptions_from_community(appid: int, lang: str = "japanese", timeout: int = 15) -> dict:
-    """Steam Community の「Global Achievements」ページを軽くパースして、
-    表示名(displayName) -> 説明(description) を返す（apiname は取れないので displayName キー）。
-    IPlayerService でも取れない場合の最後の保険。
+class _CommunityAchievementsParser(HTMLParser):
+    """Global Achievements ページを逐次パースして achieveRow ごとに
+    {name, description, percent} を取り出す。
+
+    例: <div class="achieveRow">
+          <div class="achieveTxtHolder">
+            <div class="achievePercent">12.3%</div>
+            <div class="achieveTxt"><h3>...</h3><h5>...</h5></div>
+        </div>
+    行の中だけを見るので、別の行の h3/h5 と取り違えることはない。
+    行の一覧を包む要素が閉じたら done=True（以降は読まなくてよい）。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.done = False
+        self._div_depth = 0
+        self._row = None
+        self._row_depth = None
+        self._list_depth = None  # 行を包んでいる要素の深さ
+        self._field = None  # 今テキストを集めているフィールド
+        self._field_depth = None
+        self._buf = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "div":
+            self._div_depth += 1
+            cls = ""
+            for k, v in attrs:
+                if k == "class" and v:
+                    cls = v
+                    break
+            classes = cls.split()
+            if "achieveRow" in classes and self._row is None:
+                self._row = {"name": "", "description": "", "percent": None}
+                self._row_depth = self._div_depth
+                if self._list_depth is None:
+                    self._list_depth = self._div_depth - 1
+            elif self._row is not None and "achievePercent" in classes and self._field is None:
+                self._start_field("percent", self._div_depth)
+        elif self._row is not None and self._field is None:
+            if tag == "h3":
+                self._start_field("name", None)
+            elif tag == "h5":
+                self._start_field("description", None)
+        elif tag == "footer" and self.rows:
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in ("h3", "h5") and self._field in ("name", "description"):
+            self._end_field()
+        if tag != "div":
+            return
+        if self._field == "percent" and self._div_depth == self._field_depth:
+            self._end_field()
+        if self._row is not None and self._div_depth == self._row_depth:
+            if self._row["name"]:
+                self.rows.append(self._row)
+            self._row = None
+            self._row_depth = None
+        self._div_depth -= 1
+        if self._list_depth is not None and self.rows and self._div_depth < self._list_depth:
+            self.done = True
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._buf.append(data)
+
+    def _start_field(self, field, depth):
+        self._field = field
+        self._field_depth = depth
+        self._buf = []
+
+    def _end_field(self):
+        text = " ".join("".join(self._buf).split())
+        if self._field == "percent":
+            try:
+                self._row["percent"] = float(text.replace("%", "").replace(",", ".").strip())
+            except Exception:
+                pass
+        else:
+            self._row[self._field] = text
+        self._field = None
+        self._field_depth = None
+        self._buf = []
+
+
+def _parse_community_achievement_rows(chunks) -> list:
+    """bytes のチャンク列を逐次パースする。一覧が終わった時点で読むのをやめる。
+
+    最初の achieveRow より前（ヘッダーやスクリプト）は HTML として解析せず読み飛ばす。
+    読み飛ばし中に保持するのは直近の数百文字だけなので、メモリ使用量はページサイズに依存しない。
+    """
+    parser = _CommunityAchievementsParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""  # 最初の行が見つかるまでの未処理テキスト（末尾だけ保持）
+    started = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text = decoder.decode(chunk)
+        if not started:
+            pending += text
+            pos = pending.find("achieveRow")
+            if pos < 0:
+                pending = pending[-512:]
+                continue
+            tag_start = pending.rfind("<", 0, pos)
+            if tag_start < 0:
+                pending = pending[-512:]
+                continue
+            text = pending[tag_start:]
+            pending = ""
+            started = True
+        parser.feed(text)
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.rows
+
+
+def get_global_achievement_rows_from_community(appid: int, lang: str = "japanese", timeout: int = 15,
+                                               cancel: Optional[CancelToken] = None) -> list:
+    """Steam Community の「Global Achievements」ページを取得しながらパースして、
+    [{name, description, percent}, ...] を返す（ページ上の並び順）。
+    通信 / HTTP エラーは例外のまま送出する。
     """
+    cache_key = f"{int(appid)}:{lang}"
+    cached = _cache().get("community", cache_key)
+    if isinstance(cached, list):
+        return cached
+
+    def fetch():
+        rows = _fetch_community_achievement_rows(appid, lang, timeout)
+        if rows:
+            _cache().set("community", cache_key, rows)
+        return rows
+
+    with _cancel_scope(cancel):
+        rows, _shared = _SINGLE_FLIGHT.do(("community", int(appid), lang), fetch)
+    return [dict(r) for r in rows]
+
+
+def _fetch_community_achievement_rows(appid: int, lang: str, timeout: int) -> list:
     url = f"https://steamcommunity.com/stats/{appid}/achievements?l={lang}"
+    resp = _http_get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}, stream=True)
     try:
-        resp = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
         resp.raise_for_status()
-        html_text = resp.text
-    except Exception:
-        return {}
+        return _parse_community_achievement_rows(_cancellable_iter(resp.iter_content(chunk_size=16 * 1024)))
+    finally:
+        # 途中で打ち切った場合も接続を解放する
+        resp.close()
 
-    # achieveRow の中に h3(タイトル) と h5(説明) がある想定で抽出（構造変化に備えてゆるく）
-    # 例: <div class="achieveTxt"><h3 class="ellipsis">...</h3><h5>...</h5>
-    pairs = re.findall(r"<h3[^>]*>(.*?)</h3>.*?<h5[^>]*>(.*?)</h5>", html_text, flags=re.S | re.I)
+
+def get_global_achievement_descriptions_from_community(appid: int, lang: str = "japanese", timeout: int = 15,
+                                                       cancel: Optional[CancelToken] = None) -> dict:
+    """Steam Community の「Global Achievements」ページから
+    表示名(displayName) -> 説明(description) を返す（apiname は取れないので displayName キー）。
+    IPlayerService でも取れない場合の最後の保険。
+    """
     out = {}
-    for raw_title, raw_desc in pairs:
-        title = html.unescape(re.sub(r"<[^>]+>", "", raw_title)).strip()
-        desc = html.unescape(re.sub(r"<[^>]+>", "", raw_desc)).strip()
+    for row in get_global_achievement_rows_from_community(appid, lang=lang, timeout=timeout, cancel=cancel):
+        title = (row.get("name") or "").strip()
         if title:
-            out[title] = desc
+            out[title] = (row.get("description") or "").strip()
     return out
 
 # -----------------------------
-# hidden 実績説明の最終手段（ローカル Steam キャッシュ）
+# 全体の取得率（GetGlobalAchievementPercentagesForApp）
 # -----------------------------
-# Steam クライアントは各ゲームの「実績/統計のスキーマ」を
-# <SteamRoot>/appcache/stats/UserGameStatsSchema_<AppID>.bin にキャッシュします。
-# ここには hidden 実績の説明が入っていることがあり、Web API で空のときの最後の保険になります。
-_LOCAL_SCHEMA_CACHE_LOCK = threading.Lock()
-_LOCAL_SCHEMA_CACHE: Dict[str, dict] = {}  # key = f"{appid}:{lang}" -> {apiname: {displayName, description}}
+def _global_percentages_from_community(appid: int, achievements) -> Optional[dict]:
+    """キャッシュ済みの Community ページの取得率を、表示名で照合して apiname -> % にする。
 
-def _read_config_steam_path() -> Optional[str]:
-    """config.json に steam_path / steam_root があれば利用（UIはまだ無いので手編集用）。"""
-    try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            cfg = json.load(f) or {}
-        for k in ("steam_path", "steam_root", "steam_dir"):
-            v = cfg.get(k)
-            if isinstance(v, str) and v.strip():
-                return v.strip()
-    except Exception:
+    全実績が一意に対応付けられたときだけ返す（足りなければ None = Web API に任せる）。
+    """
+    if not achievements:
         return None
+    for lang in ("japanese", "english"):
+        rows = _cache().get("community", f"{int(appid)}:{lang}")
+        if not isinstance(rows, list) or not rows:
+            continue
+        by_name = {}
+        for r in rows:
+            name = (r.get("name") or "").strip()
+            # 同じ表示名の実績は区別できない
+            by_name[name] = None if name in by_name else r.get("percent")
+        out = {}
+        for a in achievements:
+            percent = by_name.get((a.get("displayName") or "").strip())
+            if percent is None:
+                break
+            out[a.get("name")] = float(percent)
+        else:
+            return out
     return None
 
-def _detect_steam_root() -> Optional[str]:
-    # 1) env
-    for k in ("STEAM_PATH", "STEAM_ROOT", "STEAMDIR", "STEAM_HOME"):
-        v = os.environ.get(k)
-        if isinstance(v, str) and v.strip() and os.path.isdir(v.strip()):
-            return v.strip()
+def _global_percentages_known(appid: int) -> bool:
+    """取得率をリクエストせずに済みそうか（キャッシュ済み、または Community ページを取得済み / 取得中）。"""
+    appid = int(appid)
+    if isinstance(_cache().get("global_percent", str(appid)), dict):
+        return True
+    for lang in ("japanese", "english"):
+        if _SINGLE_FLIGHT.in_flight(("community", appid, lang)):
+            return True
+        if isinstance(_cache().get("community", f"{appid}:{lang}"), list):
+            return True
+    return False
 
-    # 2) config.json（任意）
+def get_global_achievement_percentages(appid: int, achievements=None, network: bool = True, timeout: int = 15,
+                                       cancel: Optional[CancelToken] = None) -> dict:
+    """apiname -> 全体の取得率(%) を返す（取れなければ空の dict）。
+
+    キャッシュ → Community ページの解析結果（achievements があれば表示名で照合）→ Web API の順。
+    """
+    appid = int(appid)
+    cached = _cache().get("global_percent", str(appid))
+    if isinstance(cached, dict):
+        return cached
+    from_community = _global_percentages_from_community(appid, achievements)
+    if from_community is not None:
+        _cache().set("global_percent", str(appid), from_community)
+        return from_community
+    if not network:
+        return {}
+
+    def fetch():
+        url = (
+            "https://api.steampowered.com/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v2/"
+            f"?gameid={appid}"
+        )
+        try:
+            r = _http_get(url, timeout=timeout)
+            r.raise_for_status()
+            js = r.json()
+        except Exception:
+            return {}
+        block = js.get("achievementpercentages") if isinstance(js, dict) else None
+        if not isinstance(block, dict):
+            return {}
+        out = {}
+        for a in block.get("achievements") or []:
+            if isinstance(a, dict) and isinstance(a.get("name"), str):
+                try:
+                    out[a["name"]] = float(a.get("percent"))
+                except (TypeError, ValueError):
+                    pass
+        _cache().set("global_percent", str(appid), out)
+        return out
+
+    with _cancel_scope(cancel):
+        out, _shared = _SINGLE_FLIGHT.do(("global_percent", appid), fetch)
+    return dict(out)
+
+# -----------------------------
+# hidden 実績説明の最終手段（ローカル Steam キャッシュ）
+# -----------------------------
+# Steam クライアントは各ゲームの「実績/統計のスキーマ」を
+# <SteamRoot>/appcache/stats/UserGameStatsSchema_<AppID>.bin にキャッシュします。
+# ここには hidden 実績の説明が入っていることがあり、Web API で空のときの最後の保険になります。
+# key = f"{appid}:{lang}" -> {apiname: {displayName, description}}
+# 追い出されてもキャッシュ DB（local_schema）から読み直すだけで、.bin の再解析はしない
+# （上限は config.json の "schema_memory_mb"、既定 32 MB）
+_LOCAL_SCHEMA_CACHE = _MemoryLRU("ローカル schema", "schema_memory_mb", 32)
+
+def _read_config_steam_path() -> Optional[str]:
+    """config.json に steam_path / steam_root があれば利用（UIはまだ無いので手編集用）。"""
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            cfg = json.load(f) or {}
+        for k in ("steam_path", "steam_root", "steam_dir"):
+            v = cfg.get(k)
+            if isinstance(v, str) and v.strip():
+                return v.strip()
+    except Exception:
+        return None
+    return None
+
+def _detect_steam_root() -> Optional[str]:
+    # 1) env
+    for k in ("STEAM_PATH", "STEAM_ROOT", "STEAMDIR", "STEAM_HOME"):
+        v = os.environ.get(k)
+        if isinstance(v, str) and v.strip() and os.path.isdir(v.strip()):
+            return v.strip()
+
+    # 2) config.json（任意）
     cfg_path = _read_config_steam_path()
     if cfg_path and os.path.isdir(cfg_path):
         return cfg_path
@@ -282,7 +1421,7 @@ def _detect_steam_root() -> Optional[str]:
             return c
     return None
 
-def _get_usergamestats_schema_path(appid: int) -> Optional[str]:
+def _get_steam_stats_dir() -> Optional[str]:
     root = _detect_steam_root()
     if not root:
         return None
@@ -290,6 +1429,12 @@ def _get_usergamestats_schema_path(appid: int) -> Optional[str]:
     stats_dir = os.path.join(root, "appcache", "stats")
     if not os.path.isdir(stats_dir):
         return None
+    return stats_dir
+
+def _get_usergamestats_schema_path(appid: int) -> Optional[str]:
+    stats_dir = _get_steam_stats_dir()
+    if not stats_dir:
+        return None
 
     # まずは一般的なファイル名（SteamID無し）
     exact = os.path.join(stats_dir, f"UserGameStatsSchema_{appid}.bin")
@@ -468,259 +1613,1806 @@ def _pick_lang(v, prefer: str = "japanese") -> Optional[str]:
                 return s
     return None
 
-def get_achievement_details_from_local_schema(appid: int, prefer_lang: str = "japanese") -> dict:
-    """UserGameStatsSchema_<appid>.bin から apiname->(displayName,description) を拾う。
+# 解析時にまとめて抽出しておく言語（補完処理はこの2つを必ず参照する）
+_LOCAL_SCHEMA_LANGS = ("japanese", "english")
+
+# キャッシュ DB の "local_schema": schema のパス -> {size, mtime_ns, langs: {lang: {apiname: {displayName, description}}},
+#                                                     bits: [[statid, bit, apiname], ...]}
+def _schema_fingerprint(schema_path: str):
+    """(size, mtime_ns) を返す。Steam クライアントがファイルを更新すると変わる。"""
+    try:
+        st = os.stat(schema_path)
+    except Exception:
+        return None
+    return int(st.st_size), int(st.st_mtime_ns)
+
+def _local_schema_store_entry(schema_path: str, fingerprint) -> Optional[dict]:
+    """フィンガープリントが一致する（= ファイルが更新されていない）エントリだけ返す。"""
+    ent = _cache().get("local_schema", schema_path)
+    if not isinstance(ent, dict):
+        return None
+    if (ent.get("size"), ent.get("mtime_ns")) != tuple(fingerprint):
+        return None
+    return ent
+
+def _local_schema_store_get(schema_path: str, fingerprint, lang: str) -> Optional[dict]:
+    ent = _local_schema_store_entry(schema_path, fingerprint)
+    langs = (ent or {}).get("langs") or {}
+    v = langs.get(lang) if isinstance(langs, dict) else None
+    return v if isinstance(v, dict) else None
+
+def _local_schema_store_get_bits(schema_path: str, fingerprint) -> Optional[list]:
+    ent = _local_schema_store_entry(schema_path, fingerprint)
+    v = (ent or {}).get("bits")
+    return v if isinstance(v, list) else None
+
+def _local_schema_store_value(fingerprint, parsed: dict) -> dict:
+    return {
+        "size": fingerprint[0],
+        "mtime_ns": fingerprint[1],
+        "langs": parsed.get("langs") or {},
+        "bits": parsed.get("bits") or [],
+    }
+
+def _local_schema_store_put(schema_path: str, fingerprint, parsed: dict) -> None:
+    _cache().set("local_schema", schema_path, _local_schema_store_value(fingerprint, parsed))
+
+def _extract_local_schema_details(kv: dict, prefer_lang: str = "japanese") -> dict:
+    """解析済みの schema(KeyValues) から apiname->{displayName, description} を抽出する。"""
+    out: dict = {}
+
+    def _pick_localized_from_display(display_dict: dict):
+        # SAM の構造: display -> { name:{lang:...}, desc:{lang:...}, ... }
+        name_node = _get_ci(display_dict, "name") or _get_ci(display_dict, "displayName") or _get_ci(display_dict, "title")
+        desc_node = _get_ci(display_dict, "desc") or _get_ci(display_dict, "description")
+        dn = _pick_lang(name_node, prefer_lang)
+        ds = _pick_lang(desc_node, prefer_lang)
+        return dn, ds
+
+    def visit(node):
+        if isinstance(node, dict):
+            api = _get_ci(node, "name") or _get_ci(node, "apiname") or _get_ci(node, "id")
+            if isinstance(api, str) and api.strip():
+                display = _get_ci(node, "display")
+                dn = ds = None
+                if isinstance(display, dict):
+                    dn, ds = _pick_localized_from_display(display)
+
+                # フォールバック（構造が違うゲーム向け）
+                if not dn:
+                    dn = _pick_lang(_get_ci(node, "displayName") or _get_ci(node, "displayname") or _get_ci(node, "title"), prefer_lang)
+                if not ds:
+                    ds = _pick_lang(_get_ci(node, "description") or _get_ci(node, "desc"), prefer_lang)
+
+                if dn or ds:
+                    cur = out.get(api) or {}
+                    if dn and not (cur.get("displayName") or "").strip():
+                        cur["displayName"] = dn
+                    if ds and not (cur.get("description") or "").strip():
+                        cur["description"] = ds
+                    out[api] = cur
+
+            for v in node.values():
+                visit(v)
+
+        elif isinstance(node, list):
+            for v in node:
+                visit(v)
+
+    visit(kv)
+    return out
+
+def _extract_local_schema_bits(kv: dict) -> list:
+    """schema の実績ビット定義を [[statid, bit, apiname], ...]（schema 順）で返す。
+
+    構造: <appid> -> stats -> <statid> -> { type: 4(ACHIEVEMENTS) / 5(GROUPACHIEVEMENTS),
+                                           bits: { <idx>: { name, bit, display } } }
+    """
+    out = []
+    root = kv
+    if len(kv) == 1:
+        only = next(iter(kv.values()))
+        if isinstance(only, dict):
+            root = only
+    stats = _get_ci(root, "stats")
+    if not isinstance(stats, dict):
+        return out
+
+    for statid, stat in stats.items():
+        if not isinstance(stat, dict):
+            continue
+        bits = _get_ci(stat, "bits")
+        if not isinstance(bits, dict):
+            continue
+        try:
+            sid = int(_get_ci(stat, "id") if _get_ci(stat, "id") is not None else statid)
+        except Exception:
+            continue
+        for idx, b in bits.items():
+            if not isinstance(b, dict):
+                continue
+            api = _get_ci(b, "name")
+            if not isinstance(api, str) or not api.strip():
+                continue
+            bit = _get_ci(b, "bit")
+            try:
+                bit = int(bit if bit is not None else idx)
+            except Exception:
+                continue
+            out.append([sid, bit, api.strip()])
+    return out
+
+def _parse_local_schema_file(schema_path: str, langs=_LOCAL_SCHEMA_LANGS) -> dict:
+    """schema ファイルを1回だけ解析して {"langs": {lang: {...}}, "bits": [...]} を返す。"""
+    data = Path(schema_path).read_bytes()
+    kv = _parse_binary_vdf(data)
+    return {
+        "langs": {lang: _extract_local_schema_details(kv, prefer_lang=lang) for lang in langs},
+        "bits": _extract_local_schema_bits(kv),
+    }
+
+def get_achievement_details_from_local_schema(appid: int, prefer_lang: str = "japanese") -> dict:
+    """UserGameStatsSchema_<appid>.bin から apiname->(displayName,description) を拾う。
+
+    Steam Web API では hidden 実績の説明が空になるゲームがあり、
+    その場合 Steam クライアントのキャッシュ(UserGameStatsSchema_*.bin) に
+    本文が入っていることがあるので最後の保険として使う。
+
+    解析結果は「パス + サイズ + 更新日時」をキーにキャッシュ DB へ保存し、
+    ファイルが更新されていない限り次回以降は解析しない。
+
+    ※このファイルは Steam クライアントが一度「実績」ページを開いたとき等に生成されます。
+    """
+    cache_key = f"{appid}:{prefer_lang}"
+    cached = _LOCAL_SCHEMA_CACHE.get(cache_key)
+    if isinstance(cached, dict):
+        return cached
+
+    schema_path = _get_usergamestats_schema_path(int(appid))
+    fingerprint = _schema_fingerprint(schema_path) if schema_path else None
+    if not schema_path or fingerprint is None:
+        # このPCに .bin が無くても、他のPCから取り込んだ抽出結果があれば使う
+        seed = _local_schema_seed(appid)
+        out = ((seed or {}).get("langs") or {}).get(prefer_lang) or {}
+        _LOCAL_SCHEMA_CACHE.put(cache_key, out)
+        return out
+
+    out = _local_schema_store_get(schema_path, fingerprint, prefer_lang)
+    if out is None:
+        langs = tuple(_LOCAL_SCHEMA_LANGS)
+        if prefer_lang not in langs:
+            langs += (prefer_lang,)
+        try:
+            parsed = _parse_local_schema_file(schema_path, langs)
+        except Exception:
+            _LOCAL_SCHEMA_CACHE.put(cache_key, {})
+            return {}
+        _local_schema_store_put(schema_path, fingerprint, parsed)
+
+        # 同時に抽出した他言語もメモリに載せておく（直後に英語で引かれるため）
+        for lang, m in parsed["langs"].items():
+            _LOCAL_SCHEMA_CACHE.put(f"{appid}:{lang}", m)
+        out = parsed["langs"].get(prefer_lang) or {}
+
+    _LOCAL_SCHEMA_CACHE.put(cache_key, out)
+    return out
+
+
+# -----------------------------
+# 取得状況のローカル読み取り（Steam クライアントのキャッシュ）
+# -----------------------------
+# Steam クライアントは schema と同じフォルダに
+# UserGameStats_<AccountID>_<AppID>.bin としてユーザーごとの進捗をキャッシュします。
+# 実績は「統計 ID ごとの整数ビットフィールド」として入っているので、schema の bits 定義で apiname に戻す。
+_STEAMID64_BASE = 76561197960265728
+
+def _steam_account_id(steam_id) -> Optional[int]:
+    """SteamID64 → AccountID（32bit）。すでに AccountID ならそのまま。"""
+    try:
+        v = int(str(steam_id).strip())
+    except Exception:
+        return None
+    if v >= _STEAMID64_BASE:
+        v -= _STEAMID64_BASE
+    return v if 0 < v < (1 << 32) else None
+
+def _get_usergamestats_path(steam_id, appid: int) -> Optional[str]:
+    stats_dir = _get_steam_stats_dir()
+    account_id = _steam_account_id(steam_id)
+    if not stats_dir or account_id is None:
+        return None
+    p = os.path.join(stats_dir, f"UserGameStats_{account_id}_{appid}.bin")
+    return p if os.path.isfile(p) else None
+
+def _get_local_schema_bits(appid: int) -> list:
+    schema_path = _get_usergamestats_schema_path(int(appid))
+    fingerprint = _schema_fingerprint(schema_path) if schema_path else None
+    if not schema_path or fingerprint is None:
+        seed = _local_schema_seed(appid)
+        bits = (seed or {}).get("bits")
+        return bits if isinstance(bits, list) else []
+
+    bits = _local_schema_store_get_bits(schema_path, fingerprint)
+    if bits is None:
+        try:
+            parsed = _parse_local_schema_file(schema_path)
+        except Exception:
+            return []
+        _local_schema_store_put(schema_path, fingerprint, parsed)
+        bits = parsed["bits"]
+    return bits
+
+def get_achievement_status_from_local_stats(steam_id, appid: int) -> Optional[dict]:
+    """UserGameStats_<AccountID>_<AppID>.bin から apiname->achieved(0/1) を返す。
+
+    get_schema_and_achievements が返す achievements_status と同じ形。
+    ファイルか schema の bits 定義が無い場合は None（= 判定不能）。
+    """
+    stats_path = _get_usergamestats_path(steam_id, int(appid))
+    if not stats_path:
+        return None
+    bits = _get_local_schema_bits(int(appid))
+    if not bits:
+        return None
+
+    try:
+        kv = _parse_binary_vdf(Path(stats_path).read_bytes())
+    except Exception:
+        return None
+    # 構造: cache -> { crc, PendingChanges, <statid>: { data: int, AchievementTimes: {...} } }
+    root = _get_ci(kv, "cache")
+    if not isinstance(root, dict):
+        root = kv
+
+    out = {}
+    for sid, bit, api in bits:
+        node = _get_ci(root, str(sid))
+        data = _get_ci(node, "data") if isinstance(node, dict) else None
+        try:
+            data = int(data or 0)
+        except Exception:
+            data = 0
+        out[api] = 1 if (data >> int(bit)) & 1 else 0
+    return out
+
+def get_unlock_times_from_local_stats(steam_id, appid: int) -> dict:
+    """UserGameStats_<AccountID>_<AppID>.bin の AchievementTimes から apiname->解除日時(UNIX 秒) を返す。"""
+    stats_path = _get_usergamestats_path(steam_id, int(appid))
+    bits = _get_local_schema_bits(int(appid)) if stats_path else []
+    if not bits:
+        return {}
+    try:
+        kv = _parse_binary_vdf(Path(stats_path).read_bytes())
+    except Exception:
+        return {}
+    root = _get_ci(kv, "cache")
+    if not isinstance(root, dict):
+        root = kv
+
+    out = {}
+    for sid, bit, api in bits:
+        node = _get_ci(root, str(sid))
+        times = _get_ci(node, "AchievementTimes") if isinstance(node, dict) else None
+        t = _get_ci(times, str(bit)) if isinstance(times, dict) else None
+        try:
+            t = int(t or 0)
+        except Exception:
+            t = 0
+        if t > 0:
+            out[api] = t
+    return out
+
+def get_unlock_times(steam_id, appid: int) -> dict:
+    """直近の GetPlayerAchievements で覚えた解除日時。無ければローカルの進捗キャッシュから読む。"""
+    appid = int(appid)
+    cached = _cache().get("unlock", f"{steam_id}:{appid}") if steam_id else None
+    if isinstance(cached, dict):
+        return cached
+    account_id = _detect_local_account_id(steam_id)
+    if account_id is None:
+        return {}
+    return get_unlock_times_from_local_stats(account_id, appid)
+
+# 推定したアカウント: (stats フォルダ, 更新日時, AccountID)。ファイルが増減するまで使い回す
+_LOCAL_ACCOUNT_LOCK = threading.Lock()
+_LOCAL_ACCOUNT_MEMO = None  # type: Optional[tuple]
+
+def _detect_local_account_id(steam_id=None) -> Optional[int]:
+    """SteamID が無いときは UserGameStats_<AccountID>_*.bin から一番多いアカウントを推定する。
+
+    オフライン Export ではゲームごとに呼ばれるので、フォルダの一覧は更新日時が変わったときだけ読み直す。
+    """
+    global _LOCAL_ACCOUNT_MEMO
+    account_id = _steam_account_id(steam_id) if steam_id else None
+    if account_id is not None:
+        return account_id
+
+    stats_dir = _get_steam_stats_dir()
+    if not stats_dir:
+        return None
+    try:
+        mtime = os.stat(stats_dir).st_mtime_ns
+    except OSError:
+        return None
+    with _LOCAL_ACCOUNT_LOCK:
+        memo = _LOCAL_ACCOUNT_MEMO
+        if memo is not None and memo[0] == stats_dir and memo[1] == mtime:
+            return memo[2]
+
+    counts: Dict[int, int] = {}
+    try:
+        for fn in os.listdir(stats_dir):
+            m = re.match(r"UserGameStats_(\d+)_(\d+)\.bin$", fn)
+            if m:
+                a = int(m.group(1))
+                counts[a] = counts.get(a, 0) + 1
+    except Exception:
+        return None
+    account_id = max(counts, key=lambda a: counts[a]) if counts else None
+    with _LOCAL_ACCOUNT_LOCK:
+        _LOCAL_ACCOUNT_MEMO = (stats_dir, mtime, account_id)
+    return account_id
+
+def get_schema_and_achievements_offline(steam_id, appid: int):
+    """ネットワークを使わずにローカルキャッシュだけで実績一覧を組み立てる。
+
+    返り値: (title, achievements, achievements_status, missing)
+      - achievements_status はローカルに進捗が無ければ None
+      - missing は取れなかった情報の集合（"title" / "status" / "description"）
+    schema も進捗も無いゲームは achievements=None。
+    """
+    appid = int(appid)
+    missing = set()
+
+    account_id = _detect_local_account_id(steam_id)
+    status = get_achievement_status_from_local_stats(account_id, appid) if account_id is not None else None
+    if status is None:
+        missing.add("status")
+
+    local_jp = get_achievement_details_from_local_schema(appid, prefer_lang="japanese") or {}
+    local_en = get_achievement_details_from_local_schema(appid, prefer_lang="english") or {}
+
+    # 並びは bits 定義（= 取得状況のキー順）を優先し、無ければ schema の出現順
+    if status is not None:
+        apinames = list(status)
+    else:
+        apinames = [api for _sid, _bit, api in _get_local_schema_bits(appid)]
+        if not apinames:
+            apinames = list(dict.fromkeys(list(local_jp) + list(local_en)))
+    if not apinames:
+        return None, None, None, missing | {"description"}
+
+    achievements = []
+    for api in apinames:
+        jp = local_jp.get(api) or {}
+        en = local_en.get(api) or {}
+        dn = (jp.get("displayName") or en.get("displayName") or api).strip()
+        ds = (jp.get("description") or en.get("description") or "").strip()
+        if not ds:
+            missing.add("description")
+        achievements.append({
+            "name": api,
+            "displayName": dn,
+            "description": ds,
+            "_desc_source": "local_schema" if ds else "none",
+        })
+
+    title = get_cached_game_title(appid) or get_local_app_name(appid)
+    if not title:
+        missing.add("title")
+        title = f"AppID:{appid}"
+    return title, achievements, status, missing
+
+def get_schema_and_achievements_local(steam_id, appid: int):
+    """ローカルキャッシュだけで get_schema_and_achievements と同じ形の結果を返す（Web API を使わない）。
+
+    実績の並びは schema の bits 順、表示名/説明は日本語→英語の順で埋める。
+    取得状況が判定できないときは (None, None, None)。
+    """
+    title, achievements, status, _missing = get_schema_and_achievements_offline(steam_id, int(appid))
+    if status is None or achievements is None:
+        return None, None, None
+    return title, achievements, status
+
+# -----------------------------
+# オフライン用：ローカルのゲーム一覧 / タイトル
+# -----------------------------
+_LOCAL_APP_NAMES_LOCK = threading.Lock()
+_LOCAL_APP_NAMES = None  # type: Optional[Dict[int, str]]
+
+def _read_text_vdf_values(path: str, key: str) -> list:
+    """テキスト VDF(acf) から "key" "value" の value を全部拾う（入れ子は気にしない）。"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except Exception:
+        return []
+    pat = r'"' + re.escape(key) + r'"\s+"((?:[^"\\]|\\.)*)"'
+    return [v.replace("\\\\", "\\") for v in re.findall(pat, text, flags=re.I)]
+
+def _get_steam_library_dirs() -> list:
+    root = _detect_steam_root()
+    if not root:
+        return []
+    dirs = [os.path.join(root, "steamapps")]
+    for vdf_path in (
+        os.path.join(root, "steamapps", "libraryfolders.vdf"),
+        os.path.join(root, "config", "libraryfolders.vdf"),
+    ):
+        for lib in _read_text_vdf_values(vdf_path, "path"):
+            d = os.path.join(lib, "steamapps")
+            if d not in dirs:
+                dirs.append(d)
+    return [d for d in dirs if os.path.isdir(d)]
+
+def _load_local_app_names() -> Dict[int, str]:
+    names: Dict[int, str] = {}
+    import glob
+    for d in _get_steam_library_dirs():
+        for p in glob.glob(os.path.join(d, "appmanifest_*.acf")):
+            m = re.search(r"appmanifest_(\d+)\.acf$", p)
+            if not m:
+                continue
+            vals = _read_text_vdf_values(p, "name")
+            if vals and vals[0].strip():
+                names[int(m.group(1))] = vals[0].strip()
+    return names
+
+def get_local_app_name(appid: int) -> Optional[str]:
+    """steamapps/appmanifest_<appid>.acf のゲーム名（インストール済みのゲームのみ）。"""
+    global _LOCAL_APP_NAMES
+    with _LOCAL_APP_NAMES_LOCK:
+        if _LOCAL_APP_NAMES is None:
+            _LOCAL_APP_NAMES = _load_local_app_names()
+        return _LOCAL_APP_NAMES.get(int(appid))
+
+def get_owned_games_local(steam_id=None) -> list:
+    """ローカルキャッシュから「遊んだことのあるゲーム」を GetOwnedGames と同じ形で返す。
+
+    UserGameStats_<AccountID>_<AppID>.bin があるゲームを対象にし、
+    アカウントが特定できないときは schema キャッシュのあるゲームすべて。
+    """
+    stats_dir = _get_steam_stats_dir()
+    if not stats_dir:
+        raise ValueError("Steam の stats フォルダが見つかりません。設定タブで Steam フォルダを指定してください。")
+
+    account_id = _detect_local_account_id(steam_id)
+    appids = set()
+    for fn in os.listdir(stats_dir):
+        if account_id is not None:
+            m = re.match(r"UserGameStats_(\d+)_(\d+)\.bin$", fn)
+            if m and int(m.group(1)) == account_id:
+                appids.add(int(m.group(2)))
+        else:
+            m = re.match(r"UserGameStatsSchema_(\d+)\.bin$", fn)
+            if m:
+                appids.add(int(m.group(1)))
+
+    games = []
+    for appid in appids:
+        name = get_cached_game_title(appid) or get_local_app_name(appid) or f"AppID {appid}"
+        games.append({"appid": appid, "name": name})
+    return games
+
+def _index_local_schema_file(schema_path: str):
+    """プロセスプール用（トップレベル関数でないと pickle できない）。"""
+    fingerprint = _schema_fingerprint(schema_path)
+    if fingerprint is None:
+        return schema_path, None, None
+    try:
+        parsed = _parse_local_schema_file(schema_path)
+    except Exception:
+        return schema_path, fingerprint, None
+    return schema_path, fingerprint, parsed
+
+def build_local_schema_index(max_workers: Optional[int] = None, progress=None) -> dict:
+    """appcache/stats の UserGameStatsSchema_*.bin を全部解析してローカル schema ストアに書き込む。
+
+    解析はプロセスプールで全コアを使って並列に行い、DB への書き込みはまとめて行う。
+    サイズ/更新日時が変わっていないファイルはスキップする。
+    progress(done, total) を渡すと進捗を通知する（ワーカースレッドから呼ばれる）。
+
+    返り値: {"total", "parsed", "skipped", "failed", "seconds"}
+    """
+    started = time.time()
+    result = {"total": 0, "parsed": 0, "skipped": 0, "failed": 0, "seconds": 0.0}
+
+    stats_dir = _get_steam_stats_dir()
+    if not stats_dir:
+        return result
+
+    import glob
+    paths = sorted(p for p in glob.glob(os.path.join(stats_dir, "UserGameStatsSchema_*.bin")) if os.path.isfile(p))
+    result["total"] = len(paths)
+
+    # 既に最新の解析結果があるファイルは対象外
+    todo = []
+    for p in paths:
+        if _local_schema_store_has_current(p):
+            result["skipped"] += 1
+        else:
+            todo.append(p)
+
+    done = result["skipped"]
+    pending = []  # DB にまとめて書き込む (path, value)
+    if progress:
+        progress(done, len(paths))
+
+    def _collect(it):
+        nonlocal done
+        for schema_path, fingerprint, parsed in it:
+            done += 1
+            if fingerprint is None or parsed is None:
+                result["failed"] += 1
+            else:
+                pending.append((schema_path, _local_schema_store_value(fingerprint, parsed)))
+                result["parsed"] += 1
+                if len(pending) >= 200:
+                    _cache().set_many("local_schema", pending)
+                    pending.clear()
+            if progress:
+                progress(done, len(paths))
+
+    if todo:
+        workers = max(1, int(max_workers or os.cpu_count() or 1))
+        remaining = todo
+        if workers > 1 and len(todo) >= 8:
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+                chunksize = max(1, len(todo) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    _collect(ex.map(_index_local_schema_file, todo, chunksize=chunksize))
+                remaining = []
+            except Exception:
+                # プロセスが使えない環境では同一プロセスで続きを処理（途中までの結果は保持）
+                remaining = [p for p in todo if not _local_schema_store_has_current(p)]
+        _collect(map(_index_local_schema_file, remaining))
+        _cache().set_many("local_schema", pending)
+
+    # プロセス内キャッシュは古い結果を持っている可能性があるので捨てる
+    _LOCAL_SCHEMA_CACHE.clear()
+
+    result["seconds"] = time.time() - started
+    return result
+
+def _local_schema_store_has_current(schema_path: str) -> bool:
+    fp = _schema_fingerprint(schema_path)
+    if fp is None:
+        return False
+    return _local_schema_store_entry(schema_path, fp) is not None
+
+def _local_schema_seed(appid: int) -> Optional[dict]:
+    v = _cache().get("local_schema_seed", str(int(appid)))
+    return v if isinstance(v, dict) else None
+
+
+# -----------------------------
+# キャッシュのスナップショット（他のPCへの持ち出し / 取り込み）
+# -----------------------------
+# 形式: gzip 圧縮の JSON Lines。1行目がヘッダ、以降は [namespace, key, value, created, expires]。
+# ユーザーごとのデータ（取得状況 "status"）は含めない。
+CACHE_SNAPSHOT_FORMAT = "steam-achievements-cache"
+CACHE_SNAPSHOT_VERSION = 1
+CACHE_SNAPSHOT_NAMESPACES = (
+    "title", "schema", "master", "community", "source_stats",
+    "neg:title", "neg:no_achievements", "local_schema_seed", "global_percent",
+)
+_SCHEMA_FILE_APPID_RE = re.compile(r"UserGameStatsSchema_(?:\d+_)?(\d+)\.bin$", re.IGNORECASE)
+
+def _snapshot_local_schema_rows(store: _CacheStore):
+    """local_schema（パスキー）を AppID キーに付け替える。パスや更新日時は他のPCでは意味が無いため。"""
+    seen = set()
+    for key, value, created, expires in store.rows("local_schema"):
+        m = _SCHEMA_FILE_APPID_RE.search(os.path.basename(key))
+        if not m or not isinstance(value, dict):
+            continue
+        appid = m.group(1)
+        seen.add(appid)
+        yield appid, {"langs": value.get("langs") or {}, "bits": value.get("bits") or []}, created, expires
+    # 取り込んだだけのもの（このPCに .bin が無い）もそのまま引き継ぐ
+    for key, value, created, expires in store.rows("local_schema_seed"):
+        if key not in seen:
+            yield key, value, created, expires
+
+def export_cache_snapshot(path: str, namespaces=CACHE_SNAPSHOT_NAMESPACES) -> dict:
+    """キャッシュ DB の内容を持ち運べる1ファイル（.jsonl.gz）に書き出す。namespace ごとの件数を返す。"""
+    import gzip
+
+    store = _cache()
+    counts: Dict[str, int] = {}
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        header = {
+            "format": CACHE_SNAPSHOT_FORMAT,
+            "version": CACHE_SNAPSHOT_VERSION,
+            "created": time.time(),
+            "namespaces": list(namespaces),
+        }
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for ns in namespaces:
+            rows = _snapshot_local_schema_rows(store) if ns == "local_schema_seed" else store.rows(ns)
+            n = 0
+            for key, value, created, expires in rows:
+                f.write(json.dumps([ns, key, value, created, expires], ensure_ascii=False, separators=(",", ":")) + "\n")
+                n += 1
+            counts[ns] = n
+    os.replace(tmp, path)
+    return counts
+
+def import_cache_snapshot(path: str) -> dict:
+    """export_cache_snapshot の出力を取り込む。
+
+    手元に同じキーの同じか新しいエントリがあれば残す。期限切れの行は捨てる。
+    {"imported": n, "kept": n, "namespaces": {ns: n}} を返す。
+    """
+    import gzip
+
+    store = _cache()
+    allowed = set(CACHE_SNAPSHOT_NAMESPACES)
+    imported: Dict[str, int] = {}
+    total = 0
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != CACHE_SNAPSHOT_FORMAT:
+            raise ValueError("キャッシュのスナップショットではありません")
+        if int(header.get("version", 0)) > CACHE_SNAPSHOT_VERSION:
+            raise ValueError(f"新しい形式のスナップショットです（version {header.get('version')}）")
+
+        pending: Dict[str, list] = {}
+
+        def _flush(ns):
+            rows = pending.pop(ns, [])
+            if rows:
+                imported[ns] = imported.get(ns, 0) + store.merge_many(ns, rows)
+
+        for line in f:
+            try:
+                ns, key, value, created, expires = json.loads(line)
+            except Exception:
+                continue
+            if ns not in allowed:
+                continue
+            total += 1
+            pending.setdefault(ns, []).append((key, value, created, expires))
+            if len(pending[ns]) >= 500:
+                _flush(ns)
+        for ns in list(pending):
+            _flush(ns)
+
+    # メモリ上の「無し」判定などが古いままにならないように捨てる
+    _LOCAL_SCHEMA_CACHE.clear()
+    _TITLE_MEMORY.clear()
+    merged = sum(imported.values())
+    return {"imported": merged, "kept": total - merged, "namespaces": imported}
+
+
+# -----------------------------
+# 補完ソースの実行計画
+# -----------------------------
+# name -> (言語, 1回あたりのリクエスト数, 空欄を埋められる見込み, キー種別, _desc_source タグ)
+# キー種別: "api" = apiname キー({displayName, description}) / "display" = 表示名キー(説明文字列)
+_FALLBACK_SOURCES = {
+    "local_schema_jp": ("japanese", 0, 0.5, "api", "local_schema"),
+    "master_jp": ("japanese", 1, 0.4, "api", "master_jp"),
+    "community_jp": ("japanese", 1, 0.3, "display", "community"),
+    "local_schema_en": ("english", 0, 0.5, "api", "local_schema"),
+    "schema_en": ("english", 1, 0.3, "api", "schema_en"),
+    "master_en": ("english", 1, 0.4, "api", "master_en"),
+    "community_en": ("english", 1, 0.3, "display", "community"),
+}
+
+def _achievement_needs_fill(a) -> bool:
+    return isinstance(a, dict) and (
+        not (a.get("description") or "").strip() or not (a.get("displayName") or "").strip()
+    )
+
+def _plan_fallback_sources(skip=()) -> list:
+    """日本語のソースを先に、同じ言語内では「リクエスト数 / 見込み」が小さい順に並べる。"""
+    names = [n for n in _FALLBACK_SOURCES if n not in skip]
+
+    def cost_key(n):
+        lang, cost, hit, _kind, _tag = _FALLBACK_SOURCES[n]
+        return (0 if lang == "japanese" else 1, cost / max(hit, 0.01))
+
+    return sorted(names, key=cost_key)
+
+def _apply_fallback_map(achievements: list, source: str, data) -> int:
+    """取得済みのソースで空欄を埋め、説明を埋めた件数を返す。"""
+    if not isinstance(data, dict) or not data:
+        return 0
+    _lang, _cost, _hit, kind, tag = _FALLBACK_SOURCES[source]
+    filled = 0
+    for a in achievements:
+        if not _achievement_needs_fill(a):
+            continue
+        if kind == "display":
+            disp = (a.get("displayName") or "").strip()
+            cd = data.get(disp) if disp else None
+            if isinstance(cd, str) and cd.strip() and not (a.get("description") or "").strip():
+                a["description"] = cd.strip()
+                a["_desc_source"] = tag
+                filled += 1
+            continue
+
+        api = a.get("name")
+        m = data.get(api) if isinstance(api, str) else None
+        if not isinstance(m, dict):
+            continue
+        if not (a.get("displayName") or "").strip():
+            dn = m.get("displayName")
+            if isinstance(dn, str) and dn.strip():
+                a["displayName"] = dn.strip()
+        if not (a.get("description") or "").strip():
+            ds = m.get("description")
+            if isinstance(ds, str) and ds.strip():
+                a["description"] = ds.strip()
+                a["_desc_source"] = tag
+                filled += 1
+    return filled
+
+# -----------------------------
+# 補完ソースの当たり外れ（ゲームごと / 永続化）
+# -----------------------------
+# キャッシュ DB の "source_stats": appid -> {source: {"hits", "misses", "errors", "streak", "last"}}
+#   streak = 連続で外れた（取得したのに1件も埋まらなかった）回数
+#   エラー（通信 / HTTP）はソースの性質とは限らないので errors に数えるだけで streak は動かさない
+_SOURCE_STATS_LOCK = threading.Lock()  # 読み込み→更新→保存をまとめるため
+
+def _get_source_stat(appid, source: str) -> dict:
+    app = _cache().get("source_stats", str(appid)) or {}
+    st = app.get(source) if isinstance(app, dict) else None
+    return dict(st) if isinstance(st, dict) else {}
+
+def _source_is_futile(appid, source: str, now: Optional[float] = None) -> bool:
+    """このゲームで外れ続けているソースなら True（再調査の時期が来たら False）。"""
+    st = _get_source_stat(appid, source)
+    streak = int(st.get("streak") or 0)
+    if streak < SOURCE_FUTILE_STREAK:
+        return False
+    now = time.time() if now is None else now
+    wait = min(SOURCE_REPROBE_SECONDS * (2 ** (streak - SOURCE_FUTILE_STREAK)), SOURCE_REPROBE_MAX_SECONDS)
+    return now - float(st.get("last") or 0) < wait
+
+def _record_source_results(appid, outcomes: dict) -> None:
+    """outcomes: {source: "hit" / "miss" / "error"} を記録して保存する。"""
+    if not outcomes:
+        return
+    now = time.time()
+    with _SOURCE_STATS_LOCK:
+        app = _cache().get("source_stats", str(appid))
+        if not isinstance(app, dict):
+            app = {}
+        for source, outcome in outcomes.items():
+            st = app.setdefault(source, {"hits": 0, "misses": 0, "errors": 0, "streak": 0, "last": 0})
+            if outcome == "hit":
+                st["hits"] = int(st.get("hits") or 0) + 1
+                st["streak"] = 0
+            elif outcome == "error":
+                st["errors"] = int(st.get("errors") or 0) + 1
+            else:
+                st["misses"] = int(st.get("misses") or 0) + 1
+                st["streak"] = int(st.get("streak") or 0) + 1
+            st["last"] = now
+        _cache().set("source_stats", str(appid), app)
+
+def _run_fallback_plan(achievements: list, fetchers: dict, skip=(), report: Optional[dict] = None, appid=None) -> dict:
+    """計画順にソースを取得して空欄を埋める。空欄が無くなったら残りは取得しない。
+
+    appid を渡すと、そのゲームで外れ続けているネットワークのソースは取得せず、
+    取得したソースの当たり外れを記録する（ローカルは無料なので常に試す）。
+
+    返り値: {source: 埋めた件数}（取得したソースのみ）
+    """
+    results = {}
+    outcomes = {}
+    saved = 0
+    for source in _plan_fallback_sources(skip):
+        cost = _FALLBACK_SOURCES[source][1]
+        if not any(_achievement_needs_fill(a) for a in achievements):
+            saved += cost
+            continue
+        fetch = fetchers.get(source)
+        if fetch is None:
+            continue
+        if appid is not None and cost > 0 and _source_is_futile(appid, source):
+            saved += cost
+            continue
+        error = False
+        try:
+            data = fetch() or {}
+        except Exception:
+            data = {}
+            error = True
+        results[source] = _apply_fallback_map(achievements, source, data)
+        if cost > 0:
+            outcomes[source] = "hit" if results[source] else ("error" if error else "miss")
+
+    if appid is not None:
+        _record_source_results(appid, outcomes)
+
+    if report is not None:
+        report["saved"] = report.get("saved", 0) + saved
+    return results
+
+
+def get_schema_and_achievements(api_key, steam_id, appid, prefer_local: bool = False, report: Optional[dict] = None,
+                                cancel: Optional[CancelToken] = None, fresh_status: bool = False):
+    """_get_schema_and_achievements を single-flight でまとめたもの。
+
+    プレビューと Export が同じゲームを同時に要求した場合は1回だけ取得して結果を共有する。
+    共有された側の report には、自分では発行しなかったリクエスト数を "saved" として加算する。
+    cancel を渡すと、取得の途中（送信中のリクエストも含む）でも FetchCancelled で打ち切る。
+    """
+    key = ("game", str(api_key), str(steam_id), int(appid), bool(prefer_local), bool(fresh_status))
+
+    def run():
+        sub_report = {}
+        result = _get_schema_and_achievements(api_key, steam_id, appid, prefer_local=prefer_local, report=sub_report,
+                                              fresh_status=fresh_status)
+        return result, sub_report
+
+    with _cancel_scope(cancel):
+        (result, sub_report), shared = _SINGLE_FLIGHT.do(key, run)
+    if report is not None:
+        report["requests"] = report.get("requests", 0) + (0 if shared else sub_report.get("requests", 0))
+        report["saved"] = report.get("saved", 0) + sub_report.get("saved", 0) + (sub_report.get("requests", 0) if shared else 0)
+
+    title, achievements, status = result
+    if shared and isinstance(achievements, list):
+        achievements = [dict(a) if isinstance(a, dict) else a for a in achievements]
+    return title, achievements, status
+
+
+def _is_app_without_achievements(playerstats) -> bool:
+    """GetPlayerAchievements の応答が「このゲームには実績が無い」を意味するか。
+
+    キャッシュは AppID だけがキーなので、ゲーム側の理由のときだけ True にする。
+    プロフィール非公開・SteamID の誤り・キーの不備などアカウント / リクエスト側のエラーは False。
+    """
+    if not isinstance(playerstats, dict):
+        return False
+    if playerstats.get("success") is True:
+        # 成功したのに achievements が無い = 実績の無いゲーム
+        return "achievements" not in playerstats
+    return "requested app has no stats" in str(playerstats.get("error") or "").lower()
+
+
+def _get_schema_and_achievements(api_key, steam_id, appid, prefer_local: bool = False, report: Optional[dict] = None,
+                                 fresh_status: bool = False):
+    """指定 AppID の実績マスタ（表示名/説明）＋取得状況を返す。
+
+    Steam Web API は hidden 実績の description を空で返すゲームがあるため、
+    GetSchemaForGame (japanese、空なら english) を土台に、以下のソースで補完します。
+
+      - ローカル Steam キャッシュ UserGameStatsSchema_<AppID>.bin (japanese/english)
+      - GetSchemaForGame (english)
+      - IPlayerService/GetGameAchievements (japanese/english)
+      - Steam Community (Global Achievements) (japanese/english) ※取れるゲームのみ
+
+    補完は _run_fallback_plan が「日本語→英語」の順に、リクエスト数と当たりやすさで
+    安いソースから試し、空欄が無くなった時点で残りは取得しない（ローカル schema は常に最初）。
+    そのゲームで外れ続けているソースは、再調査の時期が来るまで試さない。
+    report(dict) を渡すと "requests"（実際に発行した HTTP リクエスト数。キャッシュヒットは含まない）/
+    "saved"（計画やネガティブキャッシュで省略できた数）を加算する。
+
+    prefer_local=True のときは先にローカルキャッシュ（UserGameStats_*.bin + schema）を見て、
+    取得状況と説明がすべて揃えば Web API を一切使わずに返す。
+    取得状況だけ取れた場合は GetPlayerAchievements を省略して残りを Web API で補う。
+
+    fresh_status=True（Export）のときは取得状況のキャッシュを使わずに取り直す
+    （直前に解除した実績を古い状態で書き出さないため。取り直した結果はプレビュー用に保存する）。
+
+    返り値: (title, achievements(list[dict]), achievements_status(dict apiname->achieved))
+    """
+    achievements_status = None
+    if prefer_local:
+        l_title, l_achs, l_status = get_schema_and_achievements_local(steam_id, int(appid))
+        if l_status is not None and fresh_status:
+            # 以前の応答の解除日時ではなく、ローカルの進捗キャッシュの解除日時を使わせる
+            _cache().delete("unlock", f"{steam_id}:{int(appid)}")
+        if l_status is not None:
+            if l_achs and all((a.get("description") or "").strip() for a in l_achs):
+                return l_title, l_achs, l_status
+            achievements_status = l_status
+
+    if report is not None:
+        report.setdefault("requests", 0)
+        report.setdefault("saved", 0)
+    http_before = _http_request_count()
+
+    # --- ユーザー側の取得状況 ---
+    if achievements_status is None:
+        # 実績が無いと分かっている AppID は問い合わせない
+        if _negative_cache_hit("no_achievements", appid):
+            if report is not None:
+                report["saved"] += 1
+            return None, None, None
+
+        status_key = f"{steam_id}:{int(appid)}"
+        achievements_status = None if fresh_status else _cache().get("status", status_key)
+
+    if achievements_status is None:
+        stats_url = (
+            "https://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v1/"
+            f"?key={api_key}&steamid={steam_id}&appid={appid}"
+        )
+        stats_resp = _http_get(stats_url, timeout=15).json()
+        if "playerstats" not in stats_resp or "achievements" not in stats_resp["playerstats"]:
+            ps = stats_resp.get("playerstats") if isinstance(stats_resp, dict) else None
+            if _is_app_without_achievements(ps):
+                _negative_cache_put("no_achievements", appid, NO_ACHIEVEMENTS_NEGATIVE_TTL)
+            return None, None, None
+
+        player_achs = [
+            a for a in stats_resp["playerstats"]["achievements"]
+            if isinstance(a, dict) and isinstance(a.get("apiname"), str)
+        ]
+        achievements_status = {a["apiname"]: a.get("achieved") for a in player_achs}
+        _cache().set("status", status_key, achievements_status)
+        _cache().set("unlock", status_key, {
+            a["apiname"]: a["unlocktime"]
+            for a in player_achs
+            if a.get("achieved") == 1 and isinstance(a.get("unlocktime"), int) and a["unlocktime"] > 0
+        })
+
+    title, achievements = _get_achievement_schema(api_key, appid, report=report)
+
+    if report is not None:
+        report["requests"] += _http_request_count() - http_before
+    return title, achievements, achievements_status
+
+
+def _get_achievement_schema(api_key, appid, report: Optional[dict] = None):
+    """実績マスタ（GetSchemaForGame）を取得し、空の説明を補完ソースで埋める。
+
+    ユーザーに依存しない部分なので、先読み（warm_app_cache）でもこれだけを呼ぶ。
+    返り値: (title, achievements(list[dict]))
+    """
+    schema_memo = {}  # このゲームの処理中は同じ言語の schema を2回取得しない
+
+    def _download_schema(lang: str) -> list:
+        url = (
+            "https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/"
+            f"?key={api_key}&appid={appid}&l={lang}"
+        )
+        # 通信 / HTTP エラーは送出する（補完では「エラー」として記録される）
+        r = _http_get(url, timeout=15)
+        r.raise_for_status()
+        js = r.json()
+        game = js.get("game", {}) if isinstance(js, dict) else {}
+        achs = (game.get("availableGameStats", {}) or {}).get("achievements", []) or []
+        return achs if isinstance(achs, list) else []
+
+    def _download_schema_cached(lang: str) -> list:
+        cache_key = f"{int(appid)}:{lang}"
+        cached = _cache().get("schema", cache_key)
+        if isinstance(cached, list):
+            return cached
+        achs = _download_schema(lang)
+        if achs:
+            _cache().set("schema", cache_key, achs)
+        return achs
+
+    def _fetch_schema(lang: str) -> list:
+        if lang not in schema_memo:
+            achs, _shared = _SINGLE_FLIGHT.do(("schema", int(appid), lang), lambda: _download_schema_cached(lang))
+            schema_memo[lang] = achs
+        # 補完処理で書き換えるので、呼び出しごとに複製を返す
+        return [dict(a) if isinstance(a, dict) else a for a in schema_memo[lang]]
+
+    def _fetch_base_schema(lang: str) -> list:
+        try:
+            return _fetch_schema(lang)
+        except Exception:
+            return []
+
+    # --- マスタ（schema）: 日本語優先、足りないところは英語で補完 ---
+    base_lang = "japanese"
+    achievements = _fetch_base_schema("japanese")
+    if not achievements:
+        base_lang = "english"
+        achievements = _fetch_base_schema("english")
+
+    # 日本語タイトル優先（キャッシュあり）
+    title = get_game_title_prefer_jp_cached(int(appid)) or f"AppID:{appid}"
+
+    for a in achievements:
+        if isinstance(a, dict) and (a.get("description") or "").strip():
+            a["_desc_source"] = "schema_jp" if base_lang == "japanese" else "schema_en"
+
+    # --- 補完処理（安いソースから順に、空欄が無くなった時点で打ち切り） ---
+    fetchers = {
+        "schema_en": lambda: {
+            a["name"]: a for a in _fetch_schema("english")
+            if isinstance(a, dict) and isinstance(a.get("name"), str)
+        },
+        "master_jp": lambda: get_game_achievements_master(api_key, int(appid), lang="japanese"),
+        "master_en": lambda: get_game_achievements_master(api_key, int(appid), lang="english"),
+        "community_jp": lambda: get_global_achievement_descriptions_from_community(int(appid), lang="japanese"),
+        "community_en": lambda: get_global_achievement_descriptions_from_community(int(appid), lang="english"),
+        "local_schema_jp": lambda: get_achievement_details_from_local_schema(int(appid), prefer_lang="japanese"),
+        "local_schema_en": lambda: get_achievement_details_from_local_schema(int(appid), prefer_lang="english"),
+    }
+    skip = set()
+    if base_lang == "english":
+        # 英語 schema はすでに取得済み
+        skip.add("schema_en")
+    _run_fallback_plan(achievements, fetchers, skip=skip, report=report, appid=int(appid))
+
+    for a in achievements:
+        if isinstance(a, dict) and not (a.get("description") or "").strip():
+            a.setdefault("_desc_source", "none")
+
+    return title, achievements
+
+
+# -----------------------------
+# キャッシュの先読み（一覧表示後、操作が無い間に少しずつ）
+# -----------------------------
+def _warm_order(games: list) -> list:
+    """先読みの順番: 最近遊んだ順 → 総プレイ時間の長い順。実績が無いと分かっているゲームは除く。"""
+    games = [g for g in games if isinstance(g, dict) and isinstance(g.get("appid"), int)]
+    # GetOwnedGames は統計のあるゲームにだけ has_community_visible_stats を付ける（ローカル一覧には無い）
+    if any("has_community_visible_stats" in g for g in games):
+        games = [g for g in games if g.get("has_community_visible_stats")]
+    targets = games
+    targets.sort(
+        key=lambda g: (int(g.get("rtime_last_played") or 0), int(g.get("playtime_forever") or 0)),
+        reverse=True,
+    )
+    return [g["appid"] for g in targets]
+
+def warm_app_cache(api_key: str, appid: int) -> int:
+    """1ゲーム分の schema / 説明の補完データ / タイトルをキャッシュに載せる。発行したリクエスト数を返す。
+
+    ユーザーの取得状況は有効期限が短いので先読みしない。
+    _SCHEDULER に PRIORITY_PREFETCH で投入して使う（操作中の処理があれば待つ）。
+    """
+    if _negative_cache_hit("no_achievements", appid):
+        return 0
+    before = _http_request_count()
+    try:
+        _get_achievement_schema(api_key, int(appid))
+    except Exception:
+        pass
+    return _http_request_count() - before
+
+
+# -----------------------------
+# プレビュー行（右側ペイン）とそのキャッシュ
+# -----------------------------
+# key = (steamid, appid, offline, prefer_local) -> (title, rows, 取得時刻)
+# 切り替えのたびに取り直さないようにメモリに持つ（上限は config.json の "preview_memory_mb"、既定 8 MB）
+_PREVIEW_CACHE = _MemoryLRU("プレビュー", "preview_memory_mb", 8)
+
+def _preview_cache_key(steam_id, appid: int, offline: bool, prefer_local: bool):
+    return (str(steam_id), int(appid), bool(offline), bool(prefer_local))
+
+def get_cached_preview(steam_id, appid: int, offline: bool = False, prefer_local: bool = False):
+    """有効期限内のプレビュー (title, rows) を返す。無ければ None。"""
+    ent = _PREVIEW_CACHE.get(_preview_cache_key(steam_id, appid, offline, prefer_local))
+    if ent is None or time.time() - ent[2] > PREVIEW_CACHE_TTL:
+        return None
+    return ent[0], ent[1]
+
+def load_preview(api_key, steam_id, appid: int, offline: bool = False, prefer_local: bool = False,
+                 cancel: Optional[CancelToken] = None):
+    """プレビュー用の (title, rows) を取得してキャッシュする。rows は {api, name, desc, achieved} のリスト。"""
+    if offline:
+        title, achs, status, _missing = get_schema_and_achievements_offline(steam_id, int(appid))
+        if isinstance(achs, list) and status is None:
+            status = {}
+    else:
+        title, achs, status = get_schema_and_achievements(
+            api_key, steam_id, int(appid), prefer_local=prefer_local, cancel=cancel
+        )
+
+    rows = []
+    if isinstance(achs, list) and isinstance(status, dict):
+        for a in achs:
+            if not isinstance(a, dict):
+                continue
+            api = a.get("name")
+            if not isinstance(api, str):
+                continue
+            name = (a.get("displayName") or api).strip()
+            desc = (a.get("description") or "").strip()
+            achieved = bool(status.get(api))
+            rows.append({
+                "api": api,
+                "name": name,
+                "desc": desc,
+                "achieved": achieved,
+            })
+        _PREVIEW_CACHE.put(_preview_cache_key(steam_id, appid, offline, prefer_local), (title, rows, time.time()))
+    return title, rows
+
+
+# -----------------------------
+# Export パイプライン（取得 → 整形 → 書き込み）
+# -----------------------------
+class _StageQueue(queue.Queue):
+    """段と段をつなぐ上限付きキュー。深さと、満杯/空で待たされた時間を記録する。
+
+    put 側の待ち = 下流が詰まっている、get 側の待ち = 上流の供給が追いついていない。
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.name = name
+        self.max_depth = 0
+        self._depth_sum = 0
+        self._samples = 0
+        self.put_wait = 0.0
+        self.get_wait = 0.0
+
+    def put(self, item, block=True, timeout=None):
+        started = time.monotonic()
+        super().put(item, block, timeout)
+        self.put_wait += time.monotonic() - started
+        self._sample()
+
+    def get(self, block=True, timeout=None):
+        started = time.monotonic()
+        item = super().get(block, timeout)
+        self.get_wait += time.monotonic() - started
+        self._sample()
+        return item
+
+    def _sample(self):
+        depth = self.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_sum += depth
+        self._samples += 1
+
+    def summary(self) -> str:
+        avg = self._depth_sum / self._samples if self._samples else 0.0
+        return (
+            f"{self.name} 最大 {self.max_depth}/{self.maxsize} 平均 {avg:.1f}"
+            f"（投入待ち {self.put_wait:.1f} 秒 / 取り出し待ち {self.get_wait:.1f} 秒）"
+        )
+
+
+# Export の 1 行。dict ではなくタプル（namedtuple は __slots__ = () なので 1 行ぶんのメモリが小さい）
+# CSV / Excel に出す列は _export_columns、残りは JSON Lines / SQLite 用
+ExportRow = namedtuple(
+    "ExportRow", "game achieved name description missing appid apiname unlocktime desc_source percent"
+)
+
+
+def _export_rows(game_name, achievements, status, offline=False, missing=(), appid=None, unlock_times=None,
+                 percents=None):
+    """schema の実績一覧と取得状況から ExportRow のリストを作る（元の dict は持ち回らない）。"""
+    # 「欠落」列の値はゲーム単位でほぼ決まるので先に作っておく（説明が空の行だけ「説明」が付く）
+    missing_label = no_desc_label = ""
+    if offline:
+        labels = [OFFLINE_MISSING_LABELS[k] for k in ("title", "status") if k in missing]
+        missing_label = "/".join(labels)
+        no_desc_label = "/".join(labels + [OFFLINE_MISSING_LABELS["description"]])
+    status_missing = offline and "status" in missing
+
+    unlock_times = unlock_times or {}
+    percents = percents or {}
+    rows = []
+    append = rows.append
+    for a in achievements:
+        api = a.get("name")
+        desc = a.get("description", "")
+        if status_missing:
+            achieved = "？"
+        else:
+            achieved = "✅" if status.get(api) == 1 else "❌"
+        row_missing = missing_label if (desc or "").strip() else no_desc_label
+        percent = percents.get(api)
+        append(ExportRow(
+            game_name, achieved, a.get("displayName", ""), desc, row_missing,
+            appid, api, unlock_times.get(api), a.get("_desc_source"),
+            None if percent is None else round(percent, 1),
+        ))
+    return rows
+
+
+# 圧縮形式 → 付ける拡張子
+EXPORT_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd_available() -> bool:
+    try:
+        from compression import zstd  # noqa: F401  Python 3.14 以降の標準ライブラリ
+        return True
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401  任意の依存
+        return True
+    except ImportError:
+        return False
+
+
+def _resolve_export_compression(name):
+    """設定の圧縮形式を実際に使える形式にする。空や不明な値は既定の形式、zstd が無い環境では gzip にする。"""
+    name = str(name or "").strip().lower() or EXPORT_COMPRESSION_DEFAULT
+    if name == "zstd" and not _zstd_available():
+        return "gzip"
+    return name if name in EXPORT_COMPRESSIONS else EXPORT_COMPRESSION_DEFAULT
+
+
+def _parse_compression_level(value) -> Optional[int]:
+    """config.json の圧縮レベルを int にする（未設定・読めない値は None = 形式ごとの既定）。"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _open_export_text(path: str, encoding: str, compression=None, level=None):
+    """Export 用のテキストファイルを開く。compression があれば書きながら圧縮する（書き込み段のスレッドで）。"""
+    if not compression:
+        return open(path, "w", newline="", encoding=encoding, buffering=EXPORT_FILE_BUFFER)
+    import io
+    if compression == "gzip":
+        import gzip
+        binary = gzip.open(path, "wb", compresslevel=6 if level is None else int(level))
+    else:
+        try:
+            from compression import zstd
+            binary = zstd.open(path, "wb", level=level)
+        except ImportError:
+            import zstandard
+            cctx = zstandard.ZstdCompressor(level=3 if level is None else int(level))
+            binary = cctx.stream_writer(open(path, "wb"), closefd=True)
+    # 圧縮器にはまとまった量を渡す
+    return io.TextIOWrapper(io.BufferedWriter(binary, EXPORT_FILE_BUFFER), encoding=encoding, newline="")
+
+
+def _peak_memory_bytes() -> Optional[int]:
+    """このプロセスの最大メモリ使用量（取れない環境では None）。"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux は KB、macOS はバイト
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return int(counters.PeakWorkingSetSize)
+    except Exception:
+        pass
+    return None
+
+
+def _export_columns(offline: bool = False):
+    """CSV / Excel の (見出し, ExportRow から列を取り出す itemgetter)。"""
+    columns = [
+        ("ゲーム名", "game"),
+        ("取得状況", "achieved"),
+        ("実績名", "name"),
+        ("説明", "description"),
+        ("全体の取得率(%)", "percent"),
+    ]
+    if offline:
+        # オフラインでは取れなかった情報を行ごとに記録する
+        columns.append(("欠落", "missing"))
+    header = [h for h, _field in columns]
+    return header, itemgetter(*[ExportRow._fields.index(field) for _h, field in columns])
+
+
+class _CsvSink:
+    """ExportRow を CSV に書く。行は EXPORT_WRITE_BATCH 行ずつまとめて writerows する。"""
+
+    def __init__(self, path: str, offline: bool = False, compression=None, level=None):
+        header, self._columns = _export_columns(offline)
+        self.path = path + EXPORT_COMPRESSIONS.get(compression, "")
+        self._f = _open_export_text(self.path, "utf-8-sig", compression, level)
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(header)
+        self._pending = []
+
+    def write(self, rows):
+        self._pending.extend(rows)
+        if len(self._pending) >= EXPORT_WRITE_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._writer.writerows(map(self._columns, self._pending))
+            self._pending = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._f.close()
+
+
+# Excel の 1 シートの最大行数（超えたら次のシートに続ける）
+XLSX_MAX_ROWS = 1048576
+_XLSX_ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_XLSX_SHEET_NAME_CHARS = re.compile(r"[\[\]:*?/\\]")
+_XLSX_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
 
-    Steam Web API では hidden 実績の説明が空になるゲームがあり、
-    その場合 Steam クライアントのキャッシュ(UserGameStatsSchema_*.bin) に
-    本文が入っていることがあるので最後の保険として使う。
+class _XlsxSink:
+    """ExportRow を .xlsx に書く。追加のライブラリは使わず、zipfile にシートの XML を流し込む。
 
-    ※このファイルは Steam クライアントが一度「実績」ページを開いたとき等に生成されます。
+    文字列はセルに直接埋め込む（共有文字列表を作らない）ので、行数が増えてもメモリは増えない。
+    per_game=True ならゲームごとに1シート、False なら全ゲームを1シート（XLSX_MAX_ROWS 行ごとに分割）。
     """
-    cache_key = f"{appid}:{prefer_lang}"
-    with _LOCAL_SCHEMA_CACHE_LOCK:
-        cached = _LOCAL_SCHEMA_CACHE.get(cache_key)
-        if isinstance(cached, dict):
-            return cached
 
-    schema_path = _get_usergamestats_schema_path(int(appid))
-    if not schema_path:
-        with _LOCAL_SCHEMA_CACHE_LOCK:
-            _LOCAL_SCHEMA_CACHE[cache_key] = {}
-        return {}
-
-    try:
-        data = Path(schema_path).read_bytes()
-    except Exception:
-        with _LOCAL_SCHEMA_CACHE_LOCK:
-            _LOCAL_SCHEMA_CACHE[cache_key] = {}
-        return {}
+    # 列幅（ゲーム名 / 取得状況 / 実績名 / 説明 / 全体の取得率 / 欠落）
+    COLUMN_WIDTHS = (32, 8, 32, 80, 14, 24)
+
+    def __init__(self, path: str, offline: bool = False, per_game: bool = False):
+        self.path = path
+        self._header, self._columns = _export_columns(offline)
+        self._per_game = per_game
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheets = []       # [(シート名, 書庫内のパス)]
+        self._sheet_names = set()
+        self._sheet = None      # 書き込み中のシート（zip のエントリ）
+        self._sheet_rows = 0
+
+    def _sheet_name(self, name: str) -> str:
+        name = _XLSX_SHEET_NAME_CHARS.sub("_", _XLSX_ILLEGAL_CHARS.sub("", name or "")).strip("'") or "Sheet"
+        name = name[:31]
+        candidate, n = name, 2
+        while candidate.lower() in self._sheet_names:
+            suffix = f" ({n})"
+            candidate = name[:31 - len(suffix)] + suffix
+            n += 1
+        self._sheet_names.add(candidate.lower())
+        return candidate
+
+    @staticmethod
+    def _cell_xml(v) -> str:
+        if v is None or v == "":
+            return "<c/>"
+        if isinstance(v, (int, float)):
+            return f"<c><v>{v}</v></c>"
+        if "&" in v or "<" in v or ">" in v:
+            v = html.escape(v, quote=False)
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{v}</t></is></c>'
+
+    def _row_xml(self, r: int, values) -> str:
+        cell = self._cell_xml
+        return f'<row r="{r}">{"".join([cell(v) for v in values])}</row>'
+
+    def _put(self, text: str):
+        # XML に書けない制御文字はまとめて落とす（タグ側には含まれない）
+        self._sheet.write(_XLSX_ILLEGAL_CHARS.sub("", text).encode("utf-8"))
+
+    def _open_sheet(self, name: str):
+        arc = f"xl/worksheets/sheet{len(self._sheets) + 1}.xml"
+        self._sheets.append((self._sheet_name(name), arc))
+        self._sheet = self._zip.open(arc, "w", force_zip64=True)
+        cols = "".join(
+            f'<col min="{i}" max="{i}" width="{w}" customWidth="1"/>'
+            for i, w in enumerate(self.COLUMN_WIDTHS[:len(self._header)], start=1)
+        )
+        self._put(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{_XLSX_NS}">'
+            '<sheetViews><sheetView workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            '</sheetView></sheetViews>'
+            f'<cols>{cols}</cols><sheetData>'
+            + self._row_xml(1, self._header)
+        )
+        self._sheet_rows = 1
 
-    kv = _parse_binary_vdf(data)
-    out: dict = {}
+    def _close_sheet(self):
+        if self._sheet is not None:
+            self._sheet.write(b"</sheetData></worksheet>")
+            self._sheet.close()
+            self._sheet = None
 
-    def _pick_localized_from_display(display_dict: dict):
-        # SAM の構造: display -> { name:{lang:...}, desc:{lang:...}, ... }
-        name_node = _get_ci(display_dict, "name") or _get_ci(display_dict, "displayName") or _get_ci(display_dict, "title")
-        desc_node = _get_ci(display_dict, "desc") or _get_ci(display_dict, "description")
-        dn = _pick_lang(name_node, prefer_lang)
-        ds = _pick_lang(desc_node, prefer_lang)
-        return dn, ds
+    def write(self, rows):
+        if not rows:
+            return
+        if self._per_game:
+            self._close_sheet()
+            self._open_sheet(rows[0].game)
+        elif self._sheet is None:
+            self._open_sheet("実績")
+        parts = []
+        for row in rows:
+            if self._sheet_rows >= XLSX_MAX_ROWS:
+                self._put("".join(parts))
+                parts = []
+                self._close_sheet()
+                self._open_sheet(f"実績 {len(self._sheets) + 1}")
+            self._sheet_rows += 1
+            parts.append(self._row_xml(self._sheet_rows, self._columns(row)))
+        self._put("".join(parts))
+
+    def close(self):
+        try:
+            self._close_sheet()
+            if not self._sheets:
+                # 空のブックは開けないので見出しだけのシートを置く
+                self._open_sheet("実績")
+                self._close_sheet()
+            self._write_workbook()
+        finally:
+            self._zip.close()
 
-    def visit(node):
-        if isinstance(node, dict):
-            api = _get_ci(node, "name") or _get_ci(node, "apiname") or _get_ci(node, "id")
-            if isinstance(api, str) and api.strip():
-                display = _get_ci(node, "display")
-                dn = ds = None
-                if isinstance(display, dict):
-                    dn, ds = _pick_localized_from_display(display)
+    def _write_workbook(self):
+        sheet_overrides = "".join(
+            f'<Override PartName="/{arc}" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for _name, arc in self._sheets
+        )
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{sheet_overrides}</Types>'
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+            'officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+        sheets = "".join(
+            f'<sheet name="{html.escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, (name, _arc) in enumerate(self._sheets, start=1)
+        )
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_XLSX_NS}" xmlns:r="{_XLSX_REL_NS}"><sheets>{sheets}</sheets></workbook>'
+        ))
+        rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{_XLSX_REL_NS}/worksheet" Target="{arc[len("xl/"):]}"/>'
+            for i, (_name, arc) in enumerate(self._sheets, start=1)
+        )
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{rels}</Relationships>'
+        ))
 
-                # フォールバック（構造が違うゲーム向け）
-                if not dn:
-                    dn = _pick_lang(_get_ci(node, "displayName") or _get_ci(node, "displayname") or _get_ci(node, "title"), prefer_lang)
-                if not ds:
-                    ds = _pick_lang(_get_ci(node, "description") or _get_ci(node, "desc"), prefer_lang)
 
-                if dn or ds:
-                    cur = out.get(api) or {}
-                    if dn and not (cur.get("displayName") or "").strip():
-                        cur["displayName"] = dn
-                    if ds and not (cur.get("description") or "").strip():
-                        cur["description"] = ds
-                    out[api] = cur
+# 取得状況の表示 → 値（"？" = 不明は None）
+_ACHIEVED_VALUES = {"✅": True, "❌": False}
 
-            for v in node.values():
-                visit(v)
 
-        elif isinstance(node, list):
-            for v in node:
-                visit(v)
+class _JsonlSink:
+    """1 実績 1 行の JSON Lines。CSV を読み直さなくても AppID / apiname / 解除日時で扱える。"""
 
-    visit(kv)
+    def __init__(self, path: str, offline: bool = False, compression=None, level=None):
+        self.path = path + EXPORT_COMPRESSIONS.get(compression, "")
+        self._offline = offline
+        self._f = _open_export_text(self.path, "utf-8", compression, level)
 
-    with _LOCAL_SCHEMA_CACHE_LOCK:
-        _LOCAL_SCHEMA_CACHE[cache_key] = out
-    return out
+    def write(self, rows):
+        dumps = json.dumps
+        lines = []
+        for r in rows:
+            rec = {
+                "appid": r.appid,
+                "game": r.game,
+                "apiname": r.apiname,
+                "name": r.name,
+                "description": r.description,
+                "achieved": _ACHIEVED_VALUES.get(r.achieved),
+                "unlocktime": r.unlocktime,
+                "desc_source": r.desc_source,
+                "global_percent": r.percent,
+            }
+            if self._offline:
+                rec["missing"] = r.missing
+            lines.append(dumps(rec, ensure_ascii=False))
+        if lines:
+            lines.append("")
+            self._f.write("\n".join(lines))
 
+    def close(self):
+        self._f.close()
 
-def get_schema_and_achievements(api_key, steam_id, appid):
-    """指定 AppID の実績マスタ（表示名/説明）＋取得状況を返す。
 
-    Steam Web API は hidden 実績の description を空で返すゲームがあるため、
-    できる限り以下の順で補完します。
+class _SqliteSink:
+    """games / achievements の2表に書く SQLite 出力。
 
-      1) GetSchemaForGame (japanese)
-      2) GetSchemaForGame (english)  ※日本語が空のときのフォールバック
-      3) IPlayerService/GetGameAchievements (japanese/english)
-      4) Steam Community (Global Achievements) (japanese/english) ※取れるゲームのみ
-      5) ローカル Steam キャッシュ UserGameStatsSchema_<AppID>.bin (japanese/english)
+    write() には1ゲーム分の行がまとめて渡される前提で、ゲームごとに1トランザクションで入れる。
+    upsert=True のときは既存の DB を残し、(steamid, appid, apiname) ごとに前回と違う行だけ書き換える
+    （変わっていないゲームは書き込み自体をしない）。first_unlocked は「取得済み」を初めて見た日時。
+    """
 
-    返り値: (title, achievements(list[dict]), achievements_status(dict apiname->achieved))
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            steamid TEXT NOT NULL,
+            appid INTEGER NOT NULL,
+            name TEXT,
+            achievements INTEGER,
+            unlocked INTEGER,
+            updated INTEGER,
+            PRIMARY KEY (steamid, appid)
+        );
+        CREATE TABLE IF NOT EXISTS achievements (
+            steamid TEXT NOT NULL,
+            appid INTEGER NOT NULL,
+            apiname TEXT NOT NULL,
+            name TEXT,
+            description TEXT,
+            achieved INTEGER,
+            unlocktime INTEGER,
+            desc_source TEXT,
+            missing TEXT,
+            global_percent REAL,
+            first_unlocked INTEGER,
+            updated INTEGER,
+            PRIMARY KEY (steamid, appid, apiname)
+        );
+        CREATE INDEX IF NOT EXISTS achievements_unlocktime ON achievements (steamid, unlocktime);
+        CREATE INDEX IF NOT EXISTS achievements_achieved ON achievements (steamid, achieved);
     """
+    # 以前の版で作った DB に足りない列
+    _ADDED_COLUMNS = {
+        "games": (("updated", "INTEGER"),),
+        "achievements": (("first_unlocked", "INTEGER"), ("updated", "INTEGER"), ("global_percent", "REAL")),
+    }
 
-    # --- ユーザー側の取得状況 ---
-    stats_url = (
-        "https://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v1/"
-        f"?key={api_key}&steamid={steam_id}&appid={appid}"
-    )
-    stats_resp = requests.get(stats_url, timeout=15).json()
-    if "playerstats" not in stats_resp or "achievements" not in stats_resp["playerstats"]:
-        return None, None, None
+    def __init__(self, path: str, steam_id, offline: bool = False, upsert: bool = False):
+        self.path = path
+        self._steam_id = str(steam_id or "")
+        self._upsert = upsert
+        if not upsert:
+            # CSV と同じく毎回作り直す
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self.SCHEMA)
+        for table, cols in self._ADDED_COLUMNS.items():
+            have = {r[1] for r in self._db.execute(f"PRAGMA table_info({table})")}
+            for col, col_type in cols:
+                if col not in have:
+                    self._db.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}")
+        self._db.commit()
+        self.games_written = 0
+        self.games_unchanged = 0
+        self.rows_written = 0
+
+    def _stored(self, appid):
+        """前回書いた (name, description, achieved, unlocktime, desc_source, missing, global_percent) を apiname ごとに返す。"""
+        if not self._upsert:
+            return {}, None
+        cur = self._db.execute(
+            "SELECT apiname, name, description, achieved, unlocktime, desc_source, missing, global_percent"
+            " FROM achievements WHERE steamid = ? AND appid = ?",
+            (self._steam_id, appid),
+        )
+        stored = {r[0]: r[1:] for r in cur}
+        game = self._db.execute(
+            "SELECT name, achievements, unlocked FROM games WHERE steamid = ? AND appid = ?",
+            (self._steam_id, appid),
+        ).fetchone()
+        return stored, game
+
+    def write(self, rows):
+        if not rows:
+            return
+        sid = self._steam_id
+        appid = rows[0].appid
+        stored, stored_game = self._stored(appid)
 
-    achievements_status = {
-        a.get("apiname"): a.get("achieved")
-        for a in stats_resp["playerstats"]["achievements"]
-        if isinstance(a, dict) and isinstance(a.get("apiname"), str)
-    }
+        changed = []
+        unlocked = 0
+        for r in rows:
+            achieved = _ACHIEVED_VALUES.get(r.achieved)
+            old = stored.get(r.apiname)
+            achieved = None if achieved is None else int(achieved)
+            unlocktime = r.unlocktime
+            if old is not None:
+                if achieved is None:
+                    # 今回は取得状況が分からない（オフライン等）→ 前回の値を残す
+                    achieved = old[2]
+                if unlocktime is None and achieved:
+                    # 解除日時が取れなかった（ローカルの取得状況だけ等）→ 前回の値を残す
+                    unlocktime = old[3]
+            percent = r.percent
+            if percent is None and old is not None:
+                percent = old[6]
+            values = (r.name, r.description, achieved, unlocktime, r.desc_source, r.missing or None, percent)
+            if achieved:
+                unlocked += 1
+            if old != values:
+                changed.append((r.apiname, values))
+        removed = set(stored) - {r.apiname for r in rows}
+        game = (rows[0].game, len(rows), unlocked)
+
+        if not changed and not removed and stored_game == game:
+            self.games_unchanged += 1
+            return
 
-    def _fetch_schema(lang: str) -> list:
-        url = (
-            "https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/"
-            f"?key={api_key}&appid={appid}&l={lang}"
+        now = int(time.time())
+        with self._db:
+            self._db.execute(
+                "INSERT INTO games (steamid, appid, name, achievements, unlocked, updated) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (steamid, appid) DO UPDATE SET"
+                " name = excluded.name, achievements = excluded.achievements,"
+                " unlocked = excluded.unlocked, updated = excluded.updated",
+                (sid, appid) + game + (now,),
+            )
+            self._db.executemany(
+                "INSERT INTO achievements"
+                " (steamid, appid, apiname, name, description, achieved, unlocktime, desc_source, missing,"
+                " global_percent, first_unlocked, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (steamid, appid, apiname) DO UPDATE SET"
+                " name = excluded.name, description = excluded.description, achieved = excluded.achieved,"
+                " unlocktime = excluded.unlocktime, desc_source = excluded.desc_source,"
+                " missing = excluded.missing, global_percent = excluded.global_percent,"
+                " updated = excluded.updated,"
+                " first_unlocked = COALESCE(achievements.first_unlocked, excluded.first_unlocked)",
+                [
+                    (sid, appid, api) + values + (now if values[2] else None, now)
+                    for api, values in changed
+                ],
+            )
+            if removed:
+                # schema から消えた実績
+                self._db.executemany(
+                    "DELETE FROM achievements WHERE steamid = ? AND appid = ? AND apiname = ?",
+                    [(sid, appid, api) for api in removed],
+                )
+        self.games_written += 1
+        self.rows_written += len(changed) + len(removed)
+
+    def summary(self) -> str:
+        if not self._upsert:
+            return ""
+        return (
+            f"SQLite 更新: {self.games_written} ゲーム（{self.rows_written} 行）"
+            f" / 変更なし {self.games_unchanged} ゲーム"
         )
-        try:
-            r = requests.get(url, timeout=15)
-            r.raise_for_status()
-            js = r.json()
-        except Exception:
-            return []
-        game = js.get("game", {}) if isinstance(js, dict) else {}
-        achs = (game.get("availableGameStats", {}) or {}).get("achievements", []) or []
-        return achs if isinstance(achs, list) else []
 
-    # --- マスタ（schema）: 日本語優先、足りないところは英語で補完 ---
-    achievements = _fetch_schema("japanese")
-    if not achievements:
-        achievements = _fetch_schema("english")
+    def close(self):
+        self._db.close()
 
-    # 日本語タイトル優先（キャッシュあり）
-    title = get_game_title_prefer_jp_cached(int(appid)) or f"AppID:{appid}"
 
-    # schema 英語フォールバック（description/displayName が空のとき）
-    need_schema_en = any(
-        isinstance(a, dict) and (not (a.get("description") or "").strip() or not (a.get("displayName") or "").strip())
-        for a in achievements
-    )
-    schema_en_map = {}
-    if need_schema_en:
-        for a in _fetch_schema("english"):
-            if isinstance(a, dict) and isinstance(a.get("name"), str):
-                schema_en_map[a["name"]] = a
-
-    # IPlayerService master（hidden を埋められるゲームがある）
-    master_jp = get_game_achievements_master(api_key, int(appid), lang="japanese")
-    master_en = None  # 遅延
-    master_en_map = None
-
-    # Community（取れるゲームのみ / 文字列キー）
-    community_jp = {}
-    community_en = {}
-    need_community = any(isinstance(a, dict) and not (a.get("description") or "").strip() for a in achievements)
-    if need_community:
-        community_jp = get_global_achievement_descriptions_from_community(int(appid), lang="japanese") or {}
-        community_en = get_global_achievement_descriptions_from_community(int(appid), lang="english") or {}
-
-    # ローカル schema（Steam クライアントのキャッシュ）: apiname キー
-    need_local_schema = any(isinstance(a, dict) and not (a.get("description") or "").strip() for a in achievements)
-    local_schema_jp = {}
-    local_schema_en = {}
-    if need_local_schema:
-        local_schema_jp = get_achievement_details_from_local_schema(int(appid), prefer_lang="japanese") or {}
-        # 日本語が空のときに英語で補完できるように取っておく
-        local_schema_en = get_achievement_details_from_local_schema(int(appid), prefer_lang="english") or {}
-
-    # --- 補完処理 ---
-    for a in achievements:
-        if not isinstance(a, dict):
-            continue
-        api = a.get("name")
+# Export で CSV と一緒に書ける形式（設定タブのチェック → 拡張子）
+EXPORT_EXTRA_FORMATS = {"jsonl": ".jsonl", "sqlite": ".sqlite3", "xlsx": ".xlsx", "xlsx_sheets": ".xlsx"}
+# 上書きせず差分を反映する SQLite（Export のたびに CSV の名前が変わっても同じ DB に溜める）
+EXPORT_SQLITE_DB_NAME = "steam_achievements.sqlite3"
 
-        # 1) schema 由来
-        if (a.get("description") or "").strip():
-            a["_desc_source"] = "schema_jp"
-
-        # 2) schema 英語で補完（最優先：日本語を埋められないゲーム対策）
-        if isinstance(api, str) and schema_en_map:
-            se = schema_en_map.get(api)
-            if isinstance(se, dict):
-                if not (a.get("displayName") or "").strip():
-                    dn = se.get("displayName")
-                    if isinstance(dn, str) and dn.strip():
-                        a["displayName"] = dn.strip()
-                if not (a.get("description") or "").strip():
-                    ds = se.get("description")
-                    if isinstance(ds, str) and ds.strip():
-                        a["description"] = ds.strip()
-                        a["_desc_source"] = "schema_en"
-
-        # 3) master (IPlayerService) で補完
-        if isinstance(api, str) and isinstance(master_jp, dict):
-            m = master_jp.get(api)
-            if isinstance(m, dict):
-                if not (a.get("displayName") or "").strip():
-                    dn = m.get("displayName")
-                    if isinstance(dn, str) and dn.strip():
-                        a["displayName"] = dn.strip()
-                if not (a.get("description") or "").strip():
-                    ds = m.get("description")
-                    if isinstance(ds, str) and ds.strip():
-                        a["description"] = ds.strip()
-                        a["_desc_source"] = "master_jp"
-
-        # master 英語フォールバック
-        if isinstance(api, str) and not (a.get("description") or "").strip():
-            if master_en is None:
-                master_en = get_game_achievements_master(api_key, int(appid), lang="english")
-                master_en_map = master_en if isinstance(master_en, dict) else {}
-            m = (master_en_map or {}).get(api) if isinstance(master_en_map, dict) else None
-            if isinstance(m, dict):
-                ds = m.get("description")
-                if isinstance(ds, str) and ds.strip():
-                    a["description"] = ds.strip()
-                    a["_desc_source"] = "master_en"
-                if not (a.get("displayName") or "").strip():
-                    dn = m.get("displayName")
-                    if isinstance(dn, str) and dn.strip():
-                        a["displayName"] = dn.strip()
-
-        # 4) Community（displayName キー）
-        if not (a.get("description") or "").strip():
-            disp = (a.get("displayName") or "").strip()
-            if disp:
-                cd = None
-                if isinstance(community_jp, dict):
-                    cd = community_jp.get(disp)
-                if (not cd) and isinstance(community_en, dict):
-                    cd = community_en.get(disp)
-                if isinstance(cd, str) and cd.strip():
-                    a["description"] = cd.strip()
-                    a["_desc_source"] = "community"
-
-        # 5) ローカル schema（apiname キー）
-        if isinstance(api, str) and not (a.get("description") or "").strip():
-            ls = local_schema_jp.get(api) if isinstance(local_schema_jp, dict) else None
-            if not (isinstance(ls, dict) and (ls.get("description") or "").strip()):
-                ls = local_schema_en.get(api) if isinstance(local_schema_en, dict) else ls
-
-            if isinstance(ls, dict):
-                if not (a.get("displayName") or "").strip():
-                    dn = ls.get("displayName")
-                    if isinstance(dn, str) and dn.strip():
-                        a["displayName"] = dn.strip()
-                ds = ls.get("description")
-                if isinstance(ds, str) and ds.strip():
-                    a["description"] = ds.strip()
-                    a["_desc_source"] = "local_schema"
 
-        if not (a.get("description") or "").strip():
-            a.setdefault("_desc_source", "none")
+def _open_export_sinks(output_path: str, formats=(), steam_id=None, offline: bool = False,
+                       include_csv: bool = True, compression=None, level=None) -> list:
+    """CSV と、選ばれた追加形式（CSV と同じ場所・同じ名前で拡張子違い）を開く。
 
-    return title, achievements, achievements_status
+    "sqlite_upsert" だけは CSV と同じフォルダの EXPORT_SQLITE_DB_NAME に差分を反映する。
+    compression は CSV / JSON Lines にだけ掛ける（.xlsx は元から zip、SQLite は圧縮できない）。
+
+    どれかが開けなければ開いた分を閉じて例外を投げる。
+    """
+    base = os.path.splitext(output_path)[0]
+    sinks = []
+    try:
+        if include_csv:
+            sinks.append(_CsvSink(output_path, offline, compression, level))
+        for fmt in formats:
+            if fmt == "jsonl":
+                sinks.append(_JsonlSink(base + EXPORT_EXTRA_FORMATS[fmt], offline, compression, level))
+            elif fmt in ("xlsx", "xlsx_sheets"):
+                sinks.append(_XlsxSink(base + EXPORT_EXTRA_FORMATS[fmt], offline, per_game=(fmt == "xlsx_sheets")))
+            elif fmt == "sqlite":
+                sinks.append(_SqliteSink(base + EXPORT_EXTRA_FORMATS[fmt], steam_id, offline))
+            elif fmt == "sqlite_upsert":
+                path = os.path.join(os.path.dirname(output_path), EXPORT_SQLITE_DB_NAME)
+                sinks.append(_SqliteSink(path, steam_id, offline, upsert=True))
+    except Exception:
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        raise
+    return sinks
 
 
-# -----------------------------
-# GUI：丸チェック
+
+# ゲームごとにファイルを分けるときの一覧
+EXPORT_MANIFEST_NAME = "manifest.json"
+
+
+def _game_file_names(selected) -> list:
+    """ゲーム別ファイルの名前を選択順に決める（同名のゲームは AppID を付けて区別）。"""
+    names = []
+    used = set()
+    for appid, base_name in selected:
+        name = f"{safe_filename(base_name)}_achievements.csv"
+        if name.lower() in used:
+            name = f"{safe_filename(base_name)}_{appid}_achievements.csv"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _write_game_csv(path: str, rows, offline: bool = False):
+    """1ゲーム分の CSV を書く。一時ファイルに書いてから置き換えるので、失敗しても壊れたファイルは残らない。"""
+    tmp = path + ".part"
+    try:
+        sink = _CsvSink(tmp, offline)
+        try:
+            sink.write(rows)
+        finally:
+            sink.close()
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+        raise
+
+
+def _write_export_manifest(game_dir: str, entries, steam_id=None, canceled: bool = False) -> str:
+    """ゲーム別ファイルの一覧（AppID / 名前 / ファイル / 行数 / 成否）を manifest.json に書く。"""
+    path = os.path.join(game_dir, EXPORT_MANIFEST_NAME)
+    tmp = path + ".part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "steamid": str(steam_id or ""),
+                "exported_at": int(time.time()),
+                "canceled": canceled,
+                "games": entries,
+            },
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+    os.replace(tmp, path)
+    return path
+
+
+def _prune_game_files(game_dir: str, keep_names) -> list:
+    """今回選択したどのゲームの名前でもない *_achievements.csv（前回の Export で書いたもの）を消し、消した名前を返す。
+
+    選択から外したゲームや名前が変わったゲームの古いファイルを残さないため。
+    今回取得や書き込みに失敗したゲームの前回分は keep_names に入っているので消さない。
+    """
+    keep = {name.lower() for name in keep_names}
+    removed = []
+    for name in os.listdir(game_dir):
+        if not name.endswith("_achievements.csv") or name.lower() in keep:
+            continue
+        try:
+            os.remove(os.path.join(game_dir, name))
+            removed.append(name)
+        except OSError:
+            pass
+    return removed
+
 # -----------------------------
 # GUI：丸チェック
 # -----------------------------
@@ -1261,6 +3953,26 @@ class SteamAchievementsGUI:
         self.steam_id = tk.StringVar()
         self.steam_path = tk.StringVar()
         self.output_path = tk.StringVar(value=DEFAULT_OUTPUT)
+        # Steam クライアントのローカルキャッシュ（UserGameStats_*.bin）の取得状況を優先する
+        self.prefer_local_stats = tk.BooleanVar(value=False)
+        # オフラインモード：ネットワークを一切使わずローカルキャッシュだけで一覧/プレビュー/Export
+        self.offline_mode = tk.BooleanVar(value=False)
+        # 一覧取得後、操作していない間に schema / 説明をキャッシュへ先読みする
+        self.background_warm = tk.BooleanVar(value=False)
+        # CSV と一緒に JSON Lines / SQLite も書き出す
+        self.export_jsonl = tk.BooleanVar(value=False)
+        self.export_sqlite = tk.BooleanVar(value=False)
+        # SQLite は作り直さず、同じ DB に変わった行だけ反映する
+        self.export_sqlite_upsert = tk.BooleanVar(value=False)
+        # Excel（.xlsx）。ゲームごとにシートを分けるか、1シートにまとめるか
+        self.export_xlsx = tk.BooleanVar(value=False)
+        self.export_xlsx_per_game = tk.BooleanVar(value=False)
+        # ゲームごとに別の CSV をフォルダへ書き出す（manifest.json つき）
+        self.export_per_game = tk.BooleanVar(value=False)
+        # CSV / JSON Lines を圧縮して書き出す（形式とレベルは config.json で指定）
+        self.export_compress = tk.BooleanVar(value=False)
+        self._export_compression = EXPORT_COMPRESSION_DEFAULT
+        self._export_compression_level = None
 
         self.games = []
         self.round_checks = []
@@ -1274,10 +3986,19 @@ class SteamAchievementsGUI:
 
         # 日本語タイトル補完のキャンセル用トークン
         self._title_update_token = 0
+        # キャッシュ先読みの中断用トークン
+        self._warm_cancel = None
+        # プレビュー / 先読みの中断用トークン（実行は共有ワーカー _SCHEDULER）
+        self._preview_cancel = None
+        self._prefetch_cancel = None
+
+        # ローカル索引作成中フラグ
+        self._indexing = False
 
         # Export 状態
         self._exporting = False
         self._cancel_export = False
+        self._export_cancel = None
 
         # 進捗ゲージ用
         self.progress_var = tk.DoubleVar(value=0.0)
@@ -1287,7 +4008,10 @@ class SteamAchievementsGUI:
         self._setup_style()
         self._build_layout()
         self.load_config()
+        self.background_warm.trace_add("write", self._on_background_warm_changed)
+        self.offline_mode.trace_add("write", self._on_background_warm_changed)
 
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
         root.after(400, self.on_fetch_games)
 
     # -------------------------
@@ -1477,7 +4201,20 @@ class SteamAchievementsGUI:
             steam_id_var=self.steam_id,
             steam_path_var=self.steam_path,
             output_path_var=self.output_path,
+            prefer_local_var=self.prefer_local_stats,
+            offline_mode_var=self.offline_mode,
+            background_warm_var=self.background_warm,
+            export_jsonl_var=self.export_jsonl,
+            export_sqlite_var=self.export_sqlite,
+            export_sqlite_upsert_var=self.export_sqlite_upsert,
+            export_xlsx_var=self.export_xlsx,
+            export_xlsx_per_game_var=self.export_xlsx_per_game,
+            export_per_game_var=self.export_per_game,
+            export_compress_var=self.export_compress,
             save_config_callback=self.save_config,
+            build_index_callback=self.on_build_local_index,
+            export_cache_callback=self.on_export_cache_snapshot,
+            import_cache_callback=self.on_import_cache_snapshot,
         )
         self.settings_page.pack(fill="both", expand=True)
 
@@ -1940,6 +4677,8 @@ class SteamAchievementsGUI:
 
     def _clear_preview_panel(self):
         """プレビューを初期状態に戻す（チェックが0件のとき等）"""
+        if self._preview_cancel is not None:
+            self._preview_cancel.cancel()
         self._preview_current_appid = None
         self._preview_all_rows = []
         try:
@@ -1989,15 +4728,37 @@ class SteamAchievementsGUI:
     def on_preview_game(self, appid: int, fallback_name: str = ""):
         api_key = self.api_key.get().strip()
         steam_id = self.steam_id.get().strip()
-        if not api_key or not steam_id:
+        offline = bool(self.offline_mode.get())
+        if not offline and (not api_key or not steam_id):
             messagebox.showinfo("設定不足", "設定タブで API Key と SteamID64 を入力してください。")
             return
 
         self._preview_fetch_token += 1
         token = self._preview_fetch_token
         self._preview_current_appid = int(appid)
+        prefer_local = bool(self.prefer_local_stats.get())
+
+        # 前のプレビューはもう表示しないので、まだ発行していないリクエストごと打ち切る
+        if self._preview_cancel is not None:
+            self._preview_cancel.cancel()
+        cancel = CancelToken()
+        self._preview_cancel = cancel
+
+        # 最近表示した / 先読み済みのゲームは即表示
+        cached = get_cached_preview(steam_id, int(appid), offline, prefer_local)
+        if cached is not None:
+            title, rows = cached
+            self.preview_title_var.set(f"{title}")
+            self._set_preview_desc("")
+            self._preview_all_rows = rows
+            self._filter_preview()
+            self._schedule_preview_prefetch(int(appid))
+            return
 
-        disp = fallback_name or get_game_title_prefer_jp_cached(int(appid)) or "不明なゲーム"
+        if offline:
+            disp = fallback_name or get_cached_game_title(int(appid)) or "不明なゲーム"
+        else:
+            disp = fallback_name or get_game_title_prefer_jp_cached(int(appid)) or "不明なゲーム"
         self.preview_title_var.set(f"{disp} 読み込み中…")
 
         # UI を空に
@@ -2007,44 +4768,79 @@ class SteamAchievementsGUI:
 
         def worker():
             try:
-                title, achs, status = get_schema_and_achievements(api_key, steam_id, int(appid))
+                title, rows = load_preview(api_key, steam_id, int(appid), offline, prefer_local)
                 if token != self._preview_fetch_token:
                     return
 
-                rows = []
-                if isinstance(achs, list) and isinstance(status, dict):
-                    for a in achs:
-                        if not isinstance(a, dict):
-                            continue
-                        api = a.get("name")
-                        if not isinstance(api, str):
-                            continue
-                        name = (a.get("displayName") or api).strip()
-                        desc = (a.get("description") or "").strip()
-                        achieved = bool(status.get(api))
-                        rows.append({
-                            "api": api,
-                            "name": name,
-                            "desc": desc,
-                            "achieved": achieved,
-                        })
-
                 def ui():
                     if token != self._preview_fetch_token:
                         return
                     self.preview_title_var.set(f"{title}")
                     self._preview_all_rows = rows
                     self._filter_preview()
+                    self._schedule_preview_prefetch(int(appid))
 
                 self.root.after(0, ui)
 
+            except FetchCancelled:
+                return
             except Exception as e:
                 if token != self._preview_fetch_token:
                     return
                 self.root.after(0, lambda: self.preview_title_var.set(f"{disp} 取得エラー: {e}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        # 共有ワーカーで最優先に実行（Export 中でも割り込む）
+        _SCHEDULER.submit(PRIORITY_PREVIEW, worker, cancel=cancel)
+
+
+    def _schedule_preview_prefetch(self, appid: int):
+        """次に開かれそうなゲーム（他のチェック済み → 一覧で前後のゲーム）のプレビューを先読みする。
+
+        先読みのリクエストは操作中の処理より後回しになり、新しいプレビューを開くと中断する。
+        """
+        if self._prefetch_cancel is not None:
+            self._prefetch_cancel.cancel()
+        cancel = CancelToken()
+        self._prefetch_cancel = cancel
+
+        api_key = self.api_key.get().strip()
+        steam_id = self.steam_id.get().strip()
+        offline = bool(self.offline_mode.get())
+        prefer_local = bool(self.prefer_local_stats.get())
+
+        candidates = []
+        for a, _n, rc in self.round_checks:
+            if rc.get() and int(a) != int(appid):
+                candidates.append(int(a))
+
+        visible = [int(a) for a, _n, rc in self.round_checks if rc.visible]
+        if int(appid) in visible:
+            i = visible.index(int(appid))
+            for d in range(1, PREVIEW_PREFETCH_NEIGHBORS + 1):
+                for j in (i + d, i - d):
+                    if 0 <= j < len(visible):
+                        candidates.append(visible[j])
+
+        seen = {int(appid)}
+        targets = []
+        for a in candidates:
+            if a not in seen:
+                seen.add(a)
+                targets.append(a)
+        targets = targets[:PREVIEW_PREFETCH_MAX]
+        if not targets:
+            return
+
+        def job(a):
+            if get_cached_preview(steam_id, a, offline, prefer_local) is not None:
+                return
+            try:
+                load_preview(api_key, steam_id, a, offline, prefer_local)
+            except Exception:
+                pass
 
+        for a in targets:
+            _SCHEDULER.submit(PRIORITY_PREFETCH, job, a, cancel=cancel)
 
     def _filter_preview(self):
         """プレビュー行を描画（検索なし）。"""
@@ -2157,6 +4953,7 @@ class SteamAchievementsGUI:
 
         api_key = self.api_key.get().strip()
         steam_id = self.steam_id.get().strip()
+        offline = bool(self.offline_mode.get())
 
         # 既存の日本語タイトル補完スレッドをキャンセル
         self._title_update_token += 1
@@ -2169,7 +4966,10 @@ class SteamAchievementsGUI:
 
         def worker():
             try:
-                games = get_owned_games(api_key, steam_id)
+                if offline:
+                    games = get_owned_games_local(steam_id)
+                else:
+                    games = get_owned_games(api_key, steam_id)
 
                 # ここでは高速に一覧を出すため、GetOwnedGames の name をそのまま使用
                 # 日本語タイトルは一覧表示後にバックグラウンドで順次補完する
@@ -2214,9 +5014,11 @@ class SteamAchievementsGUI:
         self.filter_games()
 
         # 日本語タイトルはバックグラウンドで順次補完（UIは即表示）
-        if USE_JP_TITLE:
+        if USE_JP_TITLE and not self.offline_mode.get():
             self._start_title_update_thread(token)
 
+        self._start_cache_warmer()
+
 
     def _start_title_update_thread(self, token: int):
         """一覧表示後に、日本語タイトルを順次取得して表示を更新する（UIブロック回避）。"""
@@ -2239,7 +5041,13 @@ class SteamAchievementsGUI:
                     continue
 
                 # キャッシュあり。Store API は落ちることもあるので短めのタイムアウト。
-                jp = get_game_title_prefer_jp_cached(appid, timeout=6)
+                # 取得が必要なものだけ共有ワーカーに投入（プレビュー / Export より後回し）
+                jp = get_cached_game_title(appid)
+                if jp is None:
+                    try:
+                        jp = _SCHEDULER.submit(PRIORITY_TITLE, get_game_title_prefer_jp_cached, appid, 6).result()
+                    except Exception:
+                        jp = None
                 if token != self._title_update_token:
                     return
 
@@ -2266,14 +5074,129 @@ class SteamAchievementsGUI:
                         if updated % 25 == 0:
                             self.root.after(0, self.filter_games)
 
-                # 叩き過ぎ防止（小さくスロットル）
-                time.sleep(0.08)
-
             # 最後に1回フィルタ
             self.root.after(0, self.filter_games)
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _start_cache_warmer(self):
+        """所有ゲームの schema / 説明をキャッシュへ先読みする（最初のプレビューを待たせない）。
+
+        最近遊んだ順 → プレイ時間の長い順。1ゲームずつ共有ワーカーに先読みの優先度で投入するので、
+        プレビュー / Export / タイトル補完の実行中は止まる。一覧の再取得や設定オフで中断する。
+        """
+        if self._warm_cancel is not None:
+            self._warm_cancel.cancel()
+        cancel = CancelToken()
+        self._warm_cancel = cancel
+        if not self.background_warm.get() or self.offline_mode.get():
+            return
+        api_key = self.api_key.get().strip()
+        if not api_key or not self.games:
+            return
+        appids = _warm_order(self.games)
+
+        def worker():
+            warmed = 0
+            used = 0
+            for appid in appids:
+                try:
+                    used += _SCHEDULER.submit(PRIORITY_PREFETCH, warm_app_cache, api_key, appid, cancel=cancel).result()
+                except FetchCancelled:
+                    return
+                warmed += 1
+            if used:
+                self._log_from_thread(f"先読み 完了: {warmed} 件（API リクエスト {used} 回）")
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_background_warm_changed(self, *_):
+        # オンにしたら今の一覧で開始、オフ（またはオフラインモード）にしたら中断
+        self._start_cache_warmer()
+
+    # -----------------------------
+    # ローカル schema 索引
+    # -----------------------------
+    def on_build_local_index(self):
+        """appcache/stats の全 schema を並列解析して保存する（以後のプレビュー/Export で解析待ちが無くなる）。"""
+        if self._indexing:
+            return
+        if not _get_steam_stats_dir():
+            messagebox.showinfo("索引作成", "Steam の stats フォルダが見つかりません。\n設定タブで Steam フォルダを指定してください。")
+            return
+
+        self._indexing = True
+        self._clear_log()
+        self.log("ローカル schema の索引を作成中...")
+
+        def progress(done, total):
+            if total and (done == total or done % 200 == 0):
+                self._log_from_thread(f"  解析中... {done}/{total}")
+
+        def worker():
+            try:
+                res = build_local_schema_index(progress=progress)
+                msg = (
+                    f"索引作成 完了: {res['total']} 件"
+                    f"（解析 {res['parsed']} / 最新のためスキップ {res['skipped']} / 失敗 {res['failed']}）"
+                    f" {res['seconds']:.1f} 秒"
+                )
+            except Exception as e:
+                msg = f"索引作成 エラー: {e}"
+
+            def done():
+                self._indexing = False
+                self.log(msg)
+
+            self.root.after(0, done)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_export_cache_snapshot(self, path: str):
+        """キャッシュ DB を1ファイルに書き出す（他のPCで取り込めば最初から温まった状態で始められる）。"""
+        self._run_cache_snapshot_task(
+            "キャッシュを書き出し中...",
+            lambda: export_cache_snapshot(path),
+            lambda counts: f"キャッシュ書き出し 完了: {sum(counts.values())} 件 → {path}",
+            "キャッシュ書き出し",
+        )
+
+    def on_import_cache_snapshot(self, path: str):
+        self._run_cache_snapshot_task(
+            "キャッシュを取り込み中...",
+            lambda: import_cache_snapshot(path),
+            lambda res: f"キャッシュ取り込み 完了: {res['imported']} 件（手元が同じか新しいため維持 {res['kept']} 件）",
+            "キャッシュ取り込み",
+        )
+
+    def _run_cache_snapshot_task(self, start_msg, task, done_msg, label):
+        if self._indexing:
+            return
+        self._indexing = True
+        self._clear_log()
+        self.log(start_msg)
+
+        def worker():
+            try:
+                msg = done_msg(task())
+            except Exception as e:
+                msg = f"{label} エラー: {e}"
+
+            def done():
+                self._indexing = False
+                self.log(msg)
+
+            self.root.after(0, done)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_close(self):
+        # 終了時に残りのプレビュー / 先読みのリクエストを出さない
+        for cancel in (self._preview_cancel, self._prefetch_cancel, self._warm_cancel, self._export_cancel):
+            if cancel is not None:
+                cancel.cancel()
+        self.root.destroy()
+
     # -----------------------------
     # 進捗ゲージ制御
     # -----------------------------
@@ -2341,6 +5264,9 @@ class SteamAchievementsGUI:
         if not self._exporting:
             return
         self._cancel_export = True
+        # 取得中のゲームも、送信中のリクエストを含めてすぐに打ち切る
+        if self._export_cancel is not None:
+            self._export_cancel.cancel()
         self._log_from_thread("中止要求を受け付けました。しばらくお待ちください。")
 
     def on_export_achievements(self):
@@ -2350,8 +5276,9 @@ class SteamAchievementsGUI:
 
         api_key = self.api_key.get().strip()
         steam_id = self.steam_id.get().strip()
+        offline = bool(self.offline_mode.get())
 
-        if not api_key or not steam_id:
+        if not offline and (not api_key or not steam_id):
             messagebox.showwarning(
                 "注意", "API Key と SteamID を設定タブで入力してください。"
             )
@@ -2377,89 +5304,306 @@ class SteamAchievementsGUI:
         if not os.path.exists(base_dir):
             os.makedirs(base_dir, exist_ok=True)
 
-        output_path = os.path.join(base_dir, auto_name)
+        per_game = bool(self.export_per_game.get())
+        if per_game:
+            # ゲームごとの CSV をまとめるフォルダ
+            output_path = os.path.join(base_dir, "SteamGames_achievements")
+        else:
+            output_path = os.path.join(base_dir, auto_name)
 
         # 状態初期化
         self._clear_log()
         self.log("実績取得を開始...")
         self._reset_progress()
         self._cancel_export = False
+        self._export_cancel = CancelToken()
         self._exporting = True
         self.export_button.set_enabled(False)
         self.cancel_button.set_enabled(True)
 
+        formats = []
+        if self.export_jsonl.get():
+            formats.append("jsonl")
+        if self.export_sqlite.get():
+            formats.append("sqlite_upsert" if self.export_sqlite_upsert.get() else "sqlite")
+        if self.export_xlsx.get():
+            formats.append("xlsx_sheets" if self.export_xlsx_per_game.get() else "xlsx")
+        formats = tuple(formats)
+
         # 非同期で実績取得＆CSV書き出し（逐次書き込み）
         thread = threading.Thread(
             target=self._export_worker,
-            args=(api_key, steam_id, selected, output_path),
+            args=(api_key, steam_id, selected, output_path, bool(self.prefer_local_stats.get()), offline,
+                  self._export_cancel, formats, per_game,
+                  self._export_compression if self.export_compress.get() else None,
+                  self._export_compression_level),
             daemon=True,
         )
         thread.start()
 
-    def _export_worker(self, api_key, steam_id, selected, output_path):
+    def _export_worker(self, api_key, steam_id, selected, output_path, prefer_local=False, offline=False, cancel=None,
+                       formats=(), per_game=False, compression=None, compression_level=None):
+        """取得 → 整形 → 書き込みの3段で Export する（段の間は上限付きキュー）。
+
+        - 取得: 1ゲーム1ジョブで共有ワーカーに投入し、ExportRow まで作る（キューの上限が同時に抱えるゲーム数の上限）
+        - 整形: 選択順に結果を受け取り、リクエスト数などを集計
+        - 書き込み: このスレッド。ディスク書き込み中も取得は止まらない
+
+        formats に "jsonl" / "sqlite" などがあれば、同じ行を CSV と並べてそれぞれの形式にも書く。
+        per_game=True のときは output_path をフォルダとして、ゲームごとの CSV を取得が終わった順に
+        ワーカー上で書き、最後に manifest.json を置く（1ゲームの失敗が他のファイルに影響しない）。
+        最後まで終えたときは、今回選択したどのゲームにも当たらない前回のゲーム別 CSV を消す。
+        compression（"gzip" / "zstd"）はまとめの CSV / JSON Lines をこのスレッドで書きながら圧縮する。
+        """
         total = len(selected)
         canceled = False
         had_rows = False
-
-        # CSV を開いて、1 行ずつ書き込む
+        # API リクエスト数の集計（補完ソースの省略分も含む）
+        report = {"requests": 0, "saved": 0}
+
+        game_dir = output_path if per_game else None
+        manifest = []
+        if compression:
+            resolved = _resolve_export_compression(compression)
+            if resolved != str(compression).strip().lower():
+                self._log_from_thread(f"{compression} が使えないため {resolved} で圧縮します。")
+            compression = resolved
+
+        # CSV（と追加形式）を開いて、届いた分から書き込む
         try:
-            f = open(output_path, "w", newline="", encoding="utf-8-sig")
+            if game_dir is not None:
+                os.makedirs(game_dir, exist_ok=True)
+                # 追加形式はフォルダと並べて置く（まとめの CSV を置くはずだった名前で）
+                sinks = _open_export_sinks(game_dir + ".csv", formats, steam_id, offline, include_csv=False,
+                                           compression=compression, level=compression_level)
+            else:
+                sinks = _open_export_sinks(output_path, formats, steam_id, offline,
+                                           compression=compression, level=compression_level)
+                # 圧縮したときは拡張子が付く
+                output_path = sinks[0].path
         except Exception as e:
             self._log_from_thread(f"書き出しエラー: {e}")
+            # e は except を抜けると消えるので、ここで値を束縛しておく
             self.root.after(
                 0,
-                lambda: self._export_done(output_path, e, wrote=False, canceled=False),
+                lambda err=e: self._export_done(output_path, err, wrote=False, canceled=False),
             )
             return
 
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["ゲーム名", "取得状況", "実績名", "説明"],
-        )
-        writer.writeheader()
-
-        try:
-            for idx, (appid, base_name) in enumerate(selected, start=1):
-                if self._cancel_export:
-                    canceled = True
-                    break
-
-                self._log_from_thread(f"{base_name} (AppID: {appid}) 取得中...")
-                try:
+        # 出力ごとの書き込み時間（圧縮を含む）
+        write_time = {sink: 0.0 for sink in sinks}
+
+        fetch_q = _StageQueue("取得→整形", EXPORT_QUEUE_DEPTH)
+        write_q = _StageQueue("整形→書き込み", EXPORT_QUEUE_DEPTH)
+        done_marker = object()
+        stopped_early = []
+        # 書き込みに失敗したら（ディスク不足 / DB ロックなど）残りは取得を止めて捨て、エラーとして終える
+        write_error = None
+
+        def fetch_percentages(appid, achievements=None):
+            before = _http_request_count()
+            percents = get_global_achievement_percentages(appid, achievements, network=not offline)
+            return percents, _http_request_count() - before
+
+        def fetch_one(appid, base_name, file_name):
+            # ゲームごとに別の report（並行して書き込むため）。整形段で合算する
+            sub_report = {}
+            percent_future = None
+            percent_cancel = None
+            if (not offline and not _global_percentages_known(appid)
+                    and not _negative_cache_hit("no_achievements", appid)):
+                # 全体の取得率は別スレッドで取り、schema / 説明の補完を待つ時間に重ねる
+                # （Export の中止でも、このゲームに実績が無いと分かった時点でも止められるように）
+                percent_cancel = CancelToken(parent=cancel)
+                with _cancel_scope(percent_cancel):
+                    percent_future = _run_alongside(fetch_percentages, appid)
+            try:
+                if offline:
+                    title, achievements, status, missing = get_schema_and_achievements_offline(steam_id, appid)
+                    if achievements is not None and status is None:
+                        status = {}
+                else:
+                    # 取得状況は Export のたびに取り直す（キャッシュはプレビュー / 先読み用）
                     title, achievements, status = get_schema_and_achievements(
-                        api_key, steam_id, appid
+                        api_key, steam_id, appid, prefer_local, sub_report, fresh_status=True
                     )
-                    if achievements is None or status is None:
-                        self._log_from_thread("  ⚠ 情報なし")
-                        self._set_progress(idx, total)
-                        continue
+                    missing = set()
+            except BaseException:
+                if percent_cancel is not None:
+                    percent_cancel.cancel()
+                raise
+            if achievements is None or status is None:
+                if percent_cancel is not None:
+                    # 実績の無いゲームだった（まだ送っていなければ取得率のリクエストは出さない）
+                    percent_cancel.cancel()
+                return None, sub_report, None
+
+            # 解除日時は CSV には出さないので、追加形式があるときだけ引く
+            unlock_times = get_unlock_times(steam_id, appid) if formats and "status" not in missing else None
+            # キャッシュか Community ページの解析結果で足りるなら、ここではリクエストしない
+            percents, percent_requests = (
+                percent_future.result() if percent_future is not None else fetch_percentages(appid, achievements)
+            )
+            sub_report["requests"] = sub_report.get("requests", 0) + percent_requests
+            rows = _export_rows(title or base_name, achievements, status, offline, missing,
+                                appid=int(appid), unlock_times=unlock_times, percents=percents)
+            file_error = None
+            if game_dir is not None and rows:
+                # 取れたゲームから順に、このワーカー上でそのまま書く
+                # （失敗しても行は捨てず、追加形式には書けるように返す）
+                try:
+                    _write_game_csv(os.path.join(game_dir, file_name), rows, offline)
+                except Exception as e:
+                    file_error = e
+            return rows, sub_report, file_error
 
-                    game_name = title or base_name
+        def fetch_stage():
+            try:
+                file_names = _game_file_names(selected)
+                for idx, (appid, base_name) in enumerate(selected, start=1):
+                    if self._cancel_export:
+                        stopped_early.append(idx)
+                        break
+                    file_name = file_names[idx - 1]
+                    # 取得は共有ワーカーで（プレビューのクリックが来たらそちらを先に通す）
+                    fut = _SCHEDULER.submit(PRIORITY_EXPORT, fetch_one, appid, base_name, file_name, cancel=cancel)
+                    fetch_q.put((idx, appid, base_name, file_name, fut))
+            finally:
+                fetch_q.put(done_marker)
+
+        def merge_stage():
+            try:
+                while True:
+                    item = fetch_q.get()
+                    if item is done_marker:
+                        break
+                    idx, appid, base_name, file_name, fut = item
+                    entry = {"appid": int(appid), "name": base_name, "file": None, "rows": 0, "status": "ok"}
+                    self._log_from_thread(f"{base_name} (AppID: {appid}) 取得中...")
+                    try:
+                        rows, sub_report, file_error = fut.result()
+                    except FetchCancelled:
+                        entry["status"] = "canceled"
+                        write_q.put(("canceled", idx, None, entry))
+                        continue
+                    except Exception as e:
+                        self._log_from_thread(f"  エラー: {e}")
+                        entry.update(status="error", error=str(e))
+                        write_q.put(("rows", idx, [], entry))
+                        continue
 
-                    for a in achievements:
-                        api = a.get("name")
-                        display = a.get("displayName", "")
-                        desc = a.get("description", "")
-                        achieved = "✅" if status.get(api) == 1 else "❌"
+                    report["requests"] += sub_report.get("requests", 0)
+                    report["saved"] += sub_report.get("saved", 0)
+                    if rows is None:
+                        self._log_from_thread("  ⚠ 情報なし")
+                        entry["status"] = "empty"
+                        write_q.put(("rows", idx, [], entry))
+                        continue
 
-                        writer.writerow(
-                            {
-                                "ゲーム名": game_name,
-                                "取得状況": achieved,
-                                "実績名": display,
-                                "説明": desc,
-                            }
-                        )
-                        had_rows = True
+                    if rows:
+                        entry.update(name=rows[0].game, rows=len(rows),
+                                     unlocked=sum(1 for r in rows if r.achieved == "✅"))
+                        if file_error is not None:
+                            self._log_from_thread(f"  書き出しエラー: {file_name}: {file_error}")
+                            entry.update(status="error", error=str(file_error))
+                        elif game_dir is not None:
+                            entry["file"] = file_name
+                    write_q.put(("rows", idx, rows, entry))
+            finally:
+                write_q.put(done_marker)
+
+        stages = [
+            threading.Thread(target=fetch_stage, name="export-fetch", daemon=True),
+            threading.Thread(target=merge_stage, name="export-merge", daemon=True),
+        ]
+        for t in stages:
+            t.start()
 
-                except Exception as e:
-                    self._log_from_thread(f"  エラー: {e}")
+        try:
+            while True:
+                item = write_q.get()
+                if item is done_marker:
+                    break
+                kind, idx, rows, entry = item
+                if game_dir is not None:
+                    # ゲーム別ファイルは取得したワーカーが書き終えている（中止後に届いた分も一覧に載せる）
+                    manifest.append(entry)
+                    had_rows = had_rows or entry["file"] is not None
+                if kind == "canceled":
+                    canceled = True
+                    continue
+                if canceled or write_error is not None:
+                    # 中止後に届いた分は書かない（途中までの出力を残す）。段が止まるまで受け取りは続ける
+                    continue
+                if rows:
+                    try:
+                        for sink in sinks:
+                            started = time.perf_counter()
+                            sink.write(rows)
+                            write_time[sink] += time.perf_counter() - started
+                    except Exception as e:
+                        write_error = e
+                        self._log_from_thread(f"書き出しエラー: {sink.path}: {e}")
+                        self._cancel_export = True
+                        if cancel is not None:
+                            cancel.cancel()
+                        continue
+                    had_rows = True
 
                 # 進捗更新（すーっとアニメーション）
                 self._set_progress(idx, total)
-
         finally:
-            f.close()
+            for sink in sinks:
+                started = time.perf_counter()
+                try:
+                    sink.close()
+                except Exception as e:
+                    self._log_from_thread(f"書き出しエラー: {sink.path}: {e}")
+                write_time[sink] += time.perf_counter() - started
+        for t in stages:
+            t.join()
+        if stopped_early:
+            canceled = True
+        if game_dir is not None:
+            try:
+                manifest_path = _write_export_manifest(game_dir, manifest, steam_id, canceled)
+                written = sum(1 for e in manifest if e["file"])
+                failed = sum(1 for e in manifest if e["status"] == "error")
+                self._log_from_thread(f"ゲーム別ファイル: {written} 件（失敗 {failed} 件）→ {manifest_path}")
+                # 途中で止めたときは、まだ書いていないゲームの前回分を残す
+                if not canceled and write_error is None:
+                    removed = _prune_game_files(game_dir, _game_file_names(selected))
+                    if removed:
+                        self._log_from_thread(f"  前回の Export の古いファイルを {len(removed)} 件削除しました。")
+            except Exception as e:
+                self._log_from_thread(f"manifest の書き出しエラー: {e}")
+
+        if not offline:
+            self._log_from_thread(
+                f"API リクエスト: {report['requests']} 回（不要と判断して省略: {report['saved']} 回）"
+            )
+        self._log_from_thread(f"キュー: {fetch_q.summary()} / {write_q.summary()}")
+        if had_rows:
+            for sink in sinks:
+                try:
+                    size = f"{os.path.getsize(sink.path) / 1024 / 1024:.1f} MB"
+                except OSError:
+                    size = "?"
+                self._log_from_thread(f"出力: {sink.path}（{size} / 書き込み {write_time[sink]:.1f} 秒）")
+                summary = sink.summary() if hasattr(sink, "summary") else ""
+                if summary:
+                    self._log_from_thread(f"  {summary}")
+        peak = _peak_memory_bytes()
+        if peak:
+            self._log_from_thread(f"最大メモリ: {peak / 1024 / 1024:.0f} MB")
+        self._log_from_thread(cache_stats_summary())
+
+        if write_error is not None:
+            self.root.after(
+                0,
+                lambda err=write_error: self._export_done(output_path, err, wrote=had_rows, canceled=False),
+            )
+            return
 
         # 結果ゼロ
         if not had_rows:
@@ -2519,14 +5663,33 @@ class SteamAchievementsGUI:
     # Config Save / Load
     # -----------------------------
     def save_config(self):
+        # 画面に無い項目（手編集した steam_root や cache_max_mb など）は残す
+        try:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+            if not isinstance(cfg, dict):
+                cfg = {}
+        except Exception:
+            cfg = {}
         try:
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 json.dump(
                     {
+                        **cfg,
                         "api_key": self.api_key.get(),
                         "steam_id": self.steam_id.get(),
                         "steam_path": self.steam_path.get(),
                         "output_path": self.output_path.get(),
+                        "prefer_local_stats": bool(self.prefer_local_stats.get()),
+                        "offline_mode": bool(self.offline_mode.get()),
+                        "background_warm": bool(self.background_warm.get()),
+                        "export_jsonl": bool(self.export_jsonl.get()),
+                        "export_sqlite": bool(self.export_sqlite.get()),
+                        "export_sqlite_upsert": bool(self.export_sqlite_upsert.get()),
+                        "export_xlsx": bool(self.export_xlsx.get()),
+                        "export_xlsx_per_game": bool(self.export_xlsx_per_game.get()),
+                        "export_per_game": bool(self.export_per_game.get()),
+                        "export_compress": bool(self.export_compress.get()),
                     },
                     f,
                     indent=2,
@@ -2545,6 +5708,22 @@ class SteamAchievementsGUI:
                 self.steam_id.set(cfg.get("steam_id", ""))
                 self.steam_path.set(cfg.get("steam_path", cfg.get("steam_root", "")))
                 self.output_path.set(cfg.get("output_path", DEFAULT_OUTPUT))
+                self.prefer_local_stats.set(bool(cfg.get("prefer_local_stats", False)))
+                self.offline_mode.set(bool(cfg.get("offline_mode", False)))
+                self.background_warm.set(bool(cfg.get("background_warm", False)))
+                self.export_jsonl.set(bool(cfg.get("export_jsonl", False)))
+                self.export_sqlite.set(bool(cfg.get("export_sqlite", False)))
+                self.export_sqlite_upsert.set(bool(cfg.get("export_sqlite_upsert", False)))
+                self.export_xlsx.set(bool(cfg.get("export_xlsx", False)))
+                self.export_xlsx_per_game.set(bool(cfg.get("export_xlsx_per_game", False)))
+                self.export_per_game.set(bool(cfg.get("export_per_game", False)))
+                self.export_compress.set(bool(cfg.get("export_compress", False)))
+                self._export_compression = (
+                    str(cfg.get("export_compression") or "").strip() or EXPORT_COMPRESSION_DEFAULT
+                )
+                self._export_compression_level = _parse_compression_level(cfg.get("export_compression_level"))
+                if cfg.get("requests_per_second"):
+                    _RATE_LIMITER.configure(cfg["requests_per_second"])
         except Exception:
             pass
 
@@ -2553,6 +5732,22 @@ class SteamAchievementsGUI:
 # MAIN
 # -----------------------------
 if __name__ == "__main__":
+    # exe 化した状態で索引作成のプロセスプールを使うために必要
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # 複数のPCで使う場合のキャッシュ持ち運び（GUI は起動しない）
+    #   --export-cache <file>  キャッシュ DB を1ファイルに書き出す
+    #   --import-cache <file>  書き出したファイルを取り込む（手元の新しいエントリは維持）
+    if len(sys.argv) >= 3 and sys.argv[1] in ("--export-cache", "--import-cache"):
+        if sys.argv[1] == "--export-cache":
+            counts = export_cache_snapshot(sys.argv[2])
+            print(f"exported {sum(counts.values())} entries: {counts}")
+        else:
+            res = import_cache_snapshot(sys.argv[2])
+            print(f"imported {res['imported']} entries (kept {res['kept']} up-to-date local entries): {res['namespaces']}")
+        sys.exit(0)
+
     root = tk.Tk()
     app = SteamAchievementsGUI(root)
     root.mainloop()